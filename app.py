@@ -1,15 +1,46 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_file, send_from_directory, make_response, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
 from werkzeug.utils import secure_filename
 from functools import wraps
 import uuid
 import os
 import json
 import jwt
+import orjson
 import datetime
+import atexit
 import hashlib
+import io
+import mimetypes
 import sys
+import tempfile
+import threading
+import time
+import traceback
+import queue
+import re
+from urllib.parse import quote
+
+# BLAKE3 is optional - fall back to MD5 when it isn't installed
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# argon2-cffi is optional - fall back to Werkzeug's PBKDF2 hashes when it isn't installed
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    PasswordHasher = None
+
+# WhiteNoise is optional - without it Flask serves the React build itself
+try:
+    from whitenoise import WhiteNoise
+except ImportError:
+    WhiteNoise = None
 
 # Add ffmpeg  PATH for Whisper (Windows only)
 if sys.platform == 'win32':
@@ -28,7 +59,7 @@ if sys.platform == 'win32':
 # Import with error handling for deployment environments
 try:
     from asr_model import ASRTranscriber
-    from chatbot import is_strict_greeting, ask_ollama, get_greeting_response
+    from chatbot import is_strict_greeting, ask_ollama, ask_ollama_stream, get_greeting_response
 except Exception as e:
     print(f"⚠️ Warning: Could not load ASR/chatbot modules: {e}")
     ASRTranscriber = None
@@ -36,6 +67,7 @@ except Exception as e:
 from meetingbaas_integration import create_meeting_bot, get_bot_status, get_transcript
 from dotenv import load_dotenv
 from auto_fetch import start_auto_fetch
+from storage import DATA_LOCK, load_json_cached, save_json_cached
 
 # Load environment variables
 load_dotenv()
@@ -50,121 +82,484 @@ TRANSCRIPTS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'transcripts.
 UPLOADS_DIR = os.path.join(os.path.dirname(__file__), 'uploads')
 # Note: Whisper loads its own model (no custom one needed)
 
+# Hash used for duplicate detection: BLAKE3, or 128-bit BLAKE2b without the blake3 package
+# ('md5' entries from older uploads are still matched)
+FILE_HASH_ALGO = 'b3' if blake3 is not None else 'b2'
+
 # Allowed audio file extensions
-ALLOWED_EXTENSIONS = {'mp3', 'wav', 'ogg', 'm4a', 'flac', 'aac', 'webm'}
+ALLOWED_EXTENSIONS = frozenset({'mp3', 'wav', 'ogg', 'm4a', 'flac', 'aac', 'webm'})
+
+# Meeting platforms the MeetingBaas bot can join (matched anywhere in the URL)
+MEETING_PLATFORM_PATTERN = re.compile(r'zoom\.us|meet\.google\.com|teams\.microsoft\.com', re.IGNORECASE)
+
+# Let the front web server stream audio files instead of Python:
+#   AUDIO_SENDFILE=nginx  -> X-Accel-Redirect to AUDIO_ACCEL_PREFIX/<user_id>/<filename>
+#   AUDIO_SENDFILE=apache -> X-Sendfile (mod_xsendfile)
+AUDIO_SENDFILE = os.getenv('AUDIO_SENDFILE', '').lower()
+AUDIO_ACCEL_PREFIX = os.getenv('AUDIO_ACCEL_PREFIX', '/protected').rstrip('/')
 
 # JWT Secret Key (change this to a random secret key in production)
 SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-this-in-production')
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify and request.get_json)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__, static_folder=REACT_BUILD_DIR, static_url_path='/')
 app.config['SECRET_KEY'] = SECRET_KEY
+app.json = OrjsonProvider(app)
+app.use_x_sendfile = AUDIO_SENDFILE == 'apache'
 CORS(app)
 
+# Serve the React build through WhiteNoise (file map built once, gzip/brotli, far-future
+# caching for Vite's hashed /assets/*). Unknown paths still fall through to serve_react.
+if WhiteNoise is not None and os.path.exists(REACT_BUILD_DIR):
+    app.wsgi_app = WhiteNoise(
+        app.wsgi_app,
+        root=REACT_BUILD_DIR,
+        index_file=True,
+        autorefresh=False,
+        immutable_file_test=r'^/assets/'
+    )
+
 # Ensure uploads directory exists
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
-# Initialize ASR transcriber (lazy loading)
+# Initialize ASR transcriber (loaded in the background at startup, see below)
 transcriber = None
+transcriber_lock = threading.Lock()
 
 def get_transcriber():
     """Lazy load the ASR transcriber"""
     global transcriber
     if transcriber is None and ASRTranscriber is not None:
+        # Only one thread loads the model; others wait for it instead of loading a second copy
+        with transcriber_lock:
+            if transcriber is None:
+                try:
+                    print("🔄 Loading Whisper ASR model...")
+                    asr = ASRTranscriber()  # Whisper loads its own model
+                    asr.warmup()
+                    transcriber = asr
+                except Exception as e:
+                    print(f"❌ Failed to load ASR model: {str(e)}")
+                    traceback.print_exc()
+                    transcriber = None
+    return transcriber
+
+
+# Uploads are transcribed off the request thread by a single worker (the ASR model is
+# CPU/GPU heavy). Jobs arriving close together are drained as one batch.
+TRANSCRIBE_BATCH_SIZE = int(os.getenv('TRANSCRIBE_BATCH_SIZE', '4'))
+TRANSCRIBE_BATCH_WAIT = 0.2  # seconds to wait for more jobs before starting a batch
+transcription_queue = queue.Queue()
+
+# Clients that send `Prefer: respond-async` get 202 and poll the meeting status.
+# Others (e.g. an older build of the React app) get the finished transcript in the
+# upload response as before: the request waits for its job, up to this long.
+TRANSCRIBE_SYNC_TIMEOUT = 30 * 60  # seconds
+_transcription_waiters = {}  # meeting_id -> threading.Event set once its result is saved
+_transcription_waiters_lock = threading.Lock()
+
+
+def client_prefers_async():
+    """True if the request asked for a 202 + polling response (RFC 7240 Prefer: respond-async)"""
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def queue_transcription(user_id, username, meeting_id, file_path):
+    """
+    Queue a transcription job. Unless the client prefers async, wait for it and
+    return the saved transcript record (None if it didn't finish within TRANSCRIBE_SYNC_TIMEOUT).
+    """
+    if client_prefers_async():
+        transcription_queue.put((user_id, username, meeting_id, file_path))
+        return None
+    
+    done = threading.Event()
+    with _transcription_waiters_lock:
+        _transcription_waiters[meeting_id] = done
+    transcription_queue.put((user_id, username, meeting_id, file_path))
+    finished = done.wait(TRANSCRIBE_SYNC_TIMEOUT)
+    with _transcription_waiters_lock:
+        _transcription_waiters.pop(meeting_id, None)
+    if not finished:
+        return None
+    return load_transcripts().get(user_id, {}).get(meeting_id)
+
+
+def notify_transcription_waiters(meeting_ids):
+    """Wake the upload requests waiting for these meetings (after their results are saved)"""
+    with _transcription_waiters_lock:
+        for meeting_id in meeting_ids:
+            done = _transcription_waiters.get(meeting_id)
+            if done:
+                done.set()
+
+
+def transcription_worker():
+    """Background thread: drain queued (user_id, username, meeting_id, file_path) jobs in batches"""
+    while True:
+        jobs = [transcription_queue.get()]
+        deadline = time.monotonic() + TRANSCRIBE_BATCH_WAIT
+        while len(jobs) < TRANSCRIBE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(transcription_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
         try:
-            print("🔄 Loading Whisper ASR model...")
-            transcriber = ASRTranscriber()  # Whisper loads its own model
+            transcribe_meetings(jobs)
         except Exception as e:
-            print(f"❌ Failed to load ASR model: {str(e)}")
-            import traceback
+            print(f"❌ Transcription worker error: {e}")
             traceback.print_exc()
-            transcriber = None
-    return transcriber
 
 
-def calculate_file_hash(file_path):
-    """Calculate MD5 hash of a file"""
-    hash_md5 = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+threading.Thread(target=transcription_worker, daemon=True).start()
 
 
-def find_duplicate_audio(current_user_id, file_hash):
-    """Check if user already has this audio file (by hash)"""
+def requeue_pending_transcriptions():
+    """
+    Queue again the uploads still 'pending' from before a restart (the queue only lives in memory).
+    Run once per server, in the process that claims the background jobs.
+    """
+    transcripts = load_transcripts()
     audios = load_audios()
-    user_audios = audios.get(current_user_id, {})
+    requeued = 0
+    for user_id, user_transcripts in transcripts.items():
+        for meeting_id, record in user_transcripts.items():
+            if not isinstance(record, dict) or record.get('status') != 'pending':
+                continue
+            meeting_info = audios.get(user_id, {}).get(meeting_id, {})
+            file_path = os.path.join(UPLOADS_DIR, user_id, meeting_info.get('filename', ''))
+            if meeting_info.get('filename') and os.path.isfile(file_path):
+                username = record.get('username') or meeting_info.get('username', '')
+                transcription_queue.put((user_id, username, meeting_id, file_path))
+                requeued += 1
+    if requeued:
+        print(f"🔁 Re-queued {requeued} pending transcription(s)")
+
+
+# Preload the ASR model so the first upload doesn't pay the model load time
+# (set PRELOAD_ASR=0 to keep lazy loading, e.g. when GPU memory is tight)
+if os.getenv('PRELOAD_ASR', '1') == '1':
+    threading.Thread(target=get_transcriber, daemon=True).start()
+
+
+# Size of each read when streaming uploads
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Uploads are buffered in memory up to this size before spilling to a temp file
+UPLOAD_SPOOL_MAX_SIZE = 8 << 20  # 8 MiB
+
+# Process umask (read once at import, os.umask can only be read by setting it).
+# Spill files are created 0600, so persist() gives them the mode a plain open() would.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+UPLOAD_FILE_MODE = 0o666 & ~_UMASK
+
+
+def new_file_hasher(algo=FILE_HASH_ALGO):
+    """Create an incremental hasher for the given algorithm"""
+    if algo == 'b3':
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if algo == 'b2':
+        return hashlib.blake2b(digest_size=16)
+    return hashlib.md5()
+
+
+def calculate_stream_hash(fileobj, algo=FILE_HASH_ALGO):
+    """Calculate content hash of a seekable binary file object from the start"""
+    hasher = new_file_hasher(algo)
+    # Reuse a single 1 MiB buffer instead of allocating per chunk
+    buf = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buf)
+    fileobj.seek(0)
+    while True:
+        n = fileobj.readinto(buf)
+        if not n:
+            break
+        hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+class UploadBuffer:
+    """
+    Holds an upload in memory, spilling to a hidden temp file inside UPLOADS_DIR
+    once it grows past UPLOAD_SPOOL_MAX_SIZE. Because the spill file lives on the
+    same filesystem as the final upload, persist() renames it into place instead
+    of copying the bytes a second time.
+    """
+
+    def __init__(self):
+        self.file = io.BytesIO()
+        self.spill_path = None
+
+    def write(self, chunk):
+        if self.spill_path is None and self.file.tell() + len(chunk) > UPLOAD_SPOOL_MAX_SIZE:
+            spill = tempfile.NamedTemporaryFile(dir=UPLOADS_DIR, prefix='.upload-', delete=False)
+            spill.write(self.file.getbuffer())
+            self.file = spill
+            self.spill_path = spill.name
+        self.file.write(chunk)
+
+    def persist(self, file_path):
+        """Move the buffered upload to file_path"""
+        if self.spill_path:
+            self.file.close()
+            # Readable like small uploads (nginx serves them under AUDIO_SENDFILE=nginx)
+            os.chmod(self.spill_path, UPLOAD_FILE_MODE)
+            os.replace(self.spill_path, file_path)
+            self.spill_path = None
+        else:
+            with open(file_path, 'wb') as out:
+                out.write(self.file.getbuffer())
+            self.file.close()
+
+    def discard(self):
+        """Drop the buffered upload without writing it anywhere"""
+        self.file.close()
+        if self.spill_path:
+            os.remove(self.spill_path)
+            self.spill_path = None
+
+
+# Reverse indexes over audios.json, rebuilt only when the cached audios store changes
+# (new uploads extend it in place, see update_audio_hash_index)
+_audio_hash_index = {'audios': None}
+
+
+def add_to_audio_hash_index(index, user_id, meeting_id, meeting_info):
+    """Add one audio record to the hash lookups"""
+    if meeting_info.get('file_hash'):
+        algo = meeting_info.get('hash_algo', 'md5')
+        index['by_user'].setdefault((user_id, algo, meeting_info['file_hash']), meeting_id)
+        index['user_algos'].setdefault(user_id, set()).add(algo)
+        index['by_content'].setdefault((algo, meeting_info['file_hash']), []).append((user_id, meeting_id))
+    if meeting_info.get('content_sha256'):
+        index['by_user'].setdefault((user_id, 'sha256', meeting_info['content_sha256']), meeting_id)
+
+
+def get_audio_hash_index():
+    """
+    Return hash lookups over all uploaded audio:
+        'by_user':    {(user_id, hash_algo, file_hash): meeting_id}
+        'user_algos': {user_id: {hash_algo, ...}}
+        'by_content': {(hash_algo, file_hash): [(user_id, meeting_id), ...]} across all users
+    """
+    global _audio_hash_index
+    audios = load_audios()
+    if _audio_hash_index['audios'] is not audios:
+        index = {'by_user': {}, 'user_algos': {}, 'by_content': {}, 'legacy_sizes': {}}
+        for user_id, user_audios in audios.items():
+            for meeting_id, meeting_info in user_audios.items():
+                add_to_audio_hash_index(index, user_id, meeting_id, meeting_info)
+        index['audios'] = audios
+        _audio_hash_index = index
+    return _audio_hash_index
+
+
+def update_audio_hash_index(previous_audios, audios, user_id, meeting_id):
+    """
+    Extend the index with a single new upload instead of rebuilding it from scratch,
+    provided it was built from the store the saved one was copied from.
+    Call with DATA_LOCK held, right after save_audios.
+    """
+    index = _audio_hash_index
+    if index['audios'] is previous_audios:
+        # Swap the store in first: a reader that finds the new entry in the lookups
+        # (find_duplicate_audio reads 'audios' after them) always finds its record too
+        index['audios'] = audios
+        add_to_audio_hash_index(index, user_id, meeting_id, audios[user_id][meeting_id])
+
+
+def legacy_upload_sizes(hash_index, user_id, algo):
+    """
+    Sizes of a user's uploads hashed with another algorithm, read from disk once per index.
+    Lets find_duplicate_audio skip rehashing an upload that no such file could match.
+    Contains None if a file is missing, since its size can't rule anything out.
+    """
+    key = (user_id, algo)
+    sizes = hash_index['legacy_sizes'].get(key)
+    if sizes is None:
+        sizes = set()
+        for meeting_info in hash_index['audios'].get(user_id, {}).values():
+            if meeting_info.get('file_hash') and meeting_info.get('hash_algo', 'md5') == algo:
+                try:
+                    sizes.add(os.path.getsize(os.path.join(UPLOADS_DIR, user_id, meeting_info['filename'])))
+                except (OSError, KeyError):
+                    sizes.add(None)
+        hash_index['legacy_sizes'][key] = sizes
+    return sizes
+
+
+def find_duplicate_by_client_hash(current_user_id):
+    """
+    Check upload request headers for a hash the client computed itself:
+    If-None-Match: "<file hash>" (in FILE_HASH_ALGO) or X-Content-SHA256: <hex digest>
+    Used by the body-less /api/upload_audio/check, so duplicates are never uploaded.
+    
+    Returns:
+        tuple: (meeting_id, meeting_info) of the existing upload, or None
+    """
+    file_hash = request.headers.get('If-None-Match', '').strip().strip('"').lower()
+    if file_hash:
+        duplicate = find_duplicate_audio(current_user_id, file_hash)
+        if duplicate:
+            return duplicate
+    
+    content_sha256 = request.headers.get('X-Content-SHA256', '').strip().lower()
+    if content_sha256:
+        hash_index = get_audio_hash_index()
+        meeting_id = hash_index['by_user'].get((current_user_id, 'sha256', content_sha256))
+        if meeting_id:
+            return meeting_id, hash_index['audios'][current_user_id][meeting_id]
+    return None
+
+
+def find_duplicate_audio(current_user_id, file_hash, upload=None):
+    """
+    Check if user already has this audio file (by hash)
     
-    for meeting_id, meeting_info in user_audios.items():
-        if meeting_info.get('file_hash') == file_hash:
-            return meeting_id  # Return the existing meeting_id
+    Returns:
+        tuple: (meeting_id, meeting_info) of the existing upload, or None
+    """
+    hash_index = get_audio_hash_index()
+    by_user = hash_index['by_user']
+    
+    meeting_id = by_user.get((current_user_id, FILE_HASH_ALGO, file_hash))
+    if meeting_id:
+        # Read after the lookup - a concurrent upload may have just added this entry
+        return meeting_id, hash_index['audios'][current_user_id][meeting_id]  # Return the existing meeting
+    
+    if upload is not None:
+        # Some entries were hashed with another algorithm - hash the upload the same way,
+        # unless none of those files has the upload's size
+        upload_size = upload.seek(0, os.SEEK_END)
+        for algo in hash_index['user_algos'].get(current_user_id, ()):
+            if algo != FILE_HASH_ALGO:
+                sizes = legacy_upload_sizes(hash_index, current_user_id, algo)
+                if upload_size not in sizes and None not in sizes:
+                    continue
+                meeting_id = by_user.get((current_user_id, algo, calculate_stream_hash(upload, algo)))
+                if meeting_id:
+                    return meeting_id, hash_index['audios'][current_user_id][meeting_id]
+    return None
+
+
+def find_shared_transcript(file_hash):
+    """
+    Find a finished transcript of the same file uploaded by any user, made by the loaded ASR models
+    
+    Returns:
+        tuple: (transcript, model_version), or None if the file has to be transcribed
+    """
+    asr = transcriber
+    if asr is None or not asr.model_version:
+        return None
+    
+    transcripts = load_transcripts()
+    for user_id, meeting_id in get_audio_hash_index()['by_content'].get((FILE_HASH_ALGO, file_hash), ()):
+        record = transcripts.get(user_id, {}).get(meeting_id)
+        if isinstance(record, dict) and record.get('status') == 'done' and record.get('asr_model') == asr.model_version:
+            return record['transcript'], asr.model_version
     return None
 
 
 def load_users():
     """Load users from JSON file"""
-    if os.path.exists(USERS_FILE):
-        try:
-            with open(USERS_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-    return {}
+    return load_json_cached(USERS_FILE)
 
 
 def save_users(users):
     """Save users to JSON file. Ensure data directory exists before writing."""
-    os.makedirs(os.path.dirname(USERS_FILE), exist_ok=True)
-    with open(USERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(users, f, indent=2, ensure_ascii=False)
+    save_json_cached(USERS_FILE, users)
 
 
 def load_audios():
     """Load audio metadata from JSON file"""
-    if os.path.exists(AUDIOS_FILE):
-        try:
-            with open(AUDIOS_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-    return {}
+    return load_json_cached(AUDIOS_FILE)
 
 
 def save_audios(audios):
     """Save audio metadata to JSON file. Ensure data directory exists before writing."""
-    os.makedirs(os.path.dirname(AUDIOS_FILE), exist_ok=True)
-    with open(AUDIOS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(audios, f, indent=2, ensure_ascii=False)
+    save_json_cached(AUDIOS_FILE, audios)
 
 
 def load_transcripts():
     """Load transcripts from JSON file"""
-    if os.path.exists(TRANSCRIPTS_FILE):
-        try:
-            with open(TRANSCRIPTS_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-    return {}
+    return load_json_cached(TRANSCRIPTS_FILE)
 
 
 def save_transcripts(transcripts):
     """Save transcripts to JSON file. Ensure data directory exists before writing."""
-    os.makedirs(os.path.dirname(TRANSCRIPTS_FILE), exist_ok=True)
-    with open(TRANSCRIPTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(transcripts, f, indent=2, ensure_ascii=False)
+    save_json_cached(TRANSCRIPTS_FILE, transcripts)
+
+
+# Argon2id hasher for passwords (PBKDF2 hashes from older accounts are upgraded on login)
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2) if PasswordHasher else None
+
+
+def hash_password(password):
+    """Hash a password with Argon2id (or Werkzeug PBKDF2 if argon2-cffi is missing)"""
+    if password_hasher:
+        return password_hasher.hash(password)
+    return generate_password_hash(password)
+
+
+def verify_password(password_hash, password):
+    """
+    Check a password against a stored hash (Argon2 or legacy Werkzeug PBKDF2)
+    
+    Returns:
+        tuple: (is_valid, new_hash) - new_hash is set when the stored hash should be upgraded
+    """
+    if password_hash.startswith('$argon2'):
+        if not password_hasher:
+            return False, None
+        try:
+            password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False, None
+        if password_hasher.check_needs_rehash(password_hash):
+            return True, password_hasher.hash(password)
+        return True, None
+    
+    if not check_password_hash(password_hash, password):
+        return False, None
+    return True, (password_hasher.hash(password) if password_hasher else None)
+
+
+# Decoded JWTs: token -> (user_id, username, exp). Entries are reused until the token expires.
+TOKEN_CACHE_SIZE = 10000
+_token_cache = {}
+_token_cache_lock = threading.Lock()
 
 
-def allowed_file(filename):
-    """Check if file extension is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def decode_token(token):
+    """Verify a JWT and return (user_id, username), skipping the HS256 check for recently seen tokens"""
+    cached = _token_cache.get(token)
+    if cached and cached[2] > time.time():
+        return cached[0], cached[1]
+    
+    # Raises jwt.ExpiredSignatureError / jwt.InvalidTokenError
+    data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _token_cache.pop(next(iter(_token_cache)), None)
+        _token_cache[token] = (data['user_id'], data['username'], data['exp'])
+    return data['user_id'], data['username']
 
 
 def token_required(f):
@@ -186,9 +581,7 @@ def token_required(f):
         
         try:
             # Decode token
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user_id = data['user_id']
-            current_username = data['username']
+            current_user_id, current_username = decode_token(token)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
@@ -212,23 +605,26 @@ def signup():
     if len(username.strip()) == 0 or len(password.strip()) == 0:
         return jsonify({'error': 'Username and password cannot be empty'}), 400
     
-    # Load existing users
-    users = load_users()
-    
-    # Check if user already exists
-    if username in users:
-        return jsonify({'error': 'User already exists'}), 409
-    
-    # Create new user
-    user_id = str(uuid.uuid4())
-    users[username] = {
-        'id': user_id,
-        'username': username,
-        'password_hash': generate_password_hash(password)
-    }
+    password_hash = hash_password(password)
     
-    # Save to file
-    save_users(users)
+    with DATA_LOCK:
+        # Load existing users (copy - the loaded dict is cached)
+        users = dict(load_users())
+        
+        # Check if user already exists
+        if username in users:
+            return jsonify({'error': 'User already exists'}), 409
+        
+        # Create new user
+        user_id = str(uuid.uuid4())
+        users[username] = {
+            'id': user_id,
+            'username': username,
+            'password_hash': password_hash
+        }
+        
+        # Save to file
+        save_users(users)
     
     # Create user's upload directory
     user_upload_dir = os.path.join(UPLOADS_DIR, user_id)
@@ -261,9 +657,18 @@ def login():
         user = users[username]
         
         # Check password
-        if not check_password_hash(user['password_hash'], password):
+        is_valid, new_password_hash = verify_password(user['password_hash'], password)
+        if not is_valid:
             return jsonify({'error': 'Wrong password'}), 401
         
+        # Transparently upgrade legacy PBKDF2 (or outdated Argon2) hashes
+        if new_password_hash:
+            with DATA_LOCK:
+                users = dict(load_users())
+                if username in users:
+                    users[username] = dict(users[username], password_hash=new_password_hash)
+                    save_users(users)
+        
         # Load user's audio files
         audios = load_audios()
         user_audios = audios.get(user['id'], {})
@@ -297,7 +702,6 @@ def login():
     except Exception as e:
         # Log stacktrace server-side and return a JSON error so frontend doesn't show a generic "Network error"
         print(f"❌ Login error: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
@@ -305,21 +709,38 @@ def login():
 @app.route('/api/verify_token', methods=['GET'])
 @token_required
 def verify_token(current_user_id, current_username):
-    """Verify if token is valid and return user info"""
-    # Load user's audio files
-    audios = load_audios()
-    user_audios = audios.get(current_user_id, {})
+    """
+    Verify if token is valid and return user info (straight from the JWT).
+    Pass ?include_audios=1 to also get the user's audio files.
+    """
+    user = {
+        'id': current_user_id,
+        'username': current_username
+    }
+    
+    if request.args.get('include_audios') == '1':
+        # Load user's audio files
+        user['audio_files'] = load_audios().get(current_user_id, {})
     
     return jsonify({
         'valid': True,
-        'user': {
-            'id': current_user_id,
-            'username': current_username,
-            'audio_files': user_audios
-        }
+        'user': user
     }), 200
 
 
+@app.route('/api/upload_audio/check', methods=['POST'])
+@token_required
+def check_upload(current_user_id, current_username):
+    """
+    Duplicate pre-check before an upload: the client sends only the file's hash in headers.
+    Returns the existing meeting like upload_audio does, or 204 if the file is new.
+    """
+    duplicate = find_duplicate_by_client_hash(current_user_id)
+    if duplicate:
+        return duplicate_upload_response(current_user_id, current_username, *duplicate)
+    return '', 204
+
+
 @app.route('/api/upload_audio', methods=['POST'])
 @token_required
 def upload_audio(current_user_id, current_username):
@@ -336,115 +757,234 @@ def upload_audio(current_user_id, current_username):
         return jsonify({'error': 'No file selected'}), 400
     
     # Validate file type
-    if not allowed_file(file.filename):
-        return jsonify({'error': f'Invalid file type. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'}), 400
+    stem, dot, ext = file.filename.rpartition('.')
+    if not dot or ext.lower() not in ALLOWED_EXTENSIONS:
+        return jsonify({'error': f'Invalid file type. Allowed: {", ".join(sorted(ALLOWED_EXTENSIONS))}'}), 400
+    
+    # Secure the filename (the extension is already known to be safe) and
+    # add timestamp to filename to avoid conflicts
+    name = secure_filename(stem) or 'audio'
+    unique_filename = f"{name}_{int(time.time())}.{ext}"
+    
+    # Buffer the upload (spilling to a temp file when large) while hashing it,
+    # so duplicates never get written to the user's upload directory
+    upload = UploadBuffer()
+    hasher = new_file_hasher()
+    sha256 = hashlib.sha256()  # Stored so clients can skip re-uploads via X-Content-SHA256
+    # Reuse a single 1 MiB buffer instead of allocating per chunk
+    buf = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buf)
+    try:
+        while True:
+            n = file.stream.readinto(buf)
+            if not n:
+                break
+            chunk = view[:n]
+            hasher.update(chunk)
+            sha256.update(chunk)
+            upload.write(chunk)
+    except Exception:
+        upload.discard()
+        raise
+    
+    # File hash is used to check for duplicates
+    file_hash = hasher.hexdigest()
     
-    # Secure the filename
-    filename = secure_filename(file.filename)
+    # Check if this exact file already exists for this user
+    duplicate = find_duplicate_audio(current_user_id, file_hash, upload.file)
     
-    # Add timestamp to filename to avoid conflicts
-    import time
-    timestamp = int(time.time())
-    name, ext = os.path.splitext(filename)
-    unique_filename = f"{name}_{timestamp}{ext}"
+    if duplicate:
+        # Discard the buffered duplicate upload
+        upload.discard()
+        return duplicate_upload_response(current_user_id, current_username, *duplicate)
     
-    # Create user directory if it doesn't exist
+    # Not a duplicate - create user directory if it doesn't exist and persist the upload
     user_upload_dir = os.path.join(UPLOADS_DIR, current_user_id)
     os.makedirs(user_upload_dir, exist_ok=True)
+    file_path = os.path.join(user_upload_dir, unique_filename)
+    upload.persist(file_path)
     
-    # Save file temporarily to calculate hash
-    temp_file_path = os.path.join(user_upload_dir, unique_filename)
-    file.save(temp_file_path)
-    
-    # Calculate file hash to check for duplicates
-    file_hash = calculate_file_hash(temp_file_path)
-    
-    # Check if this exact file already exists for this user
-    existing_meeting_id = find_duplicate_audio(current_user_id, file_hash)
+    # Same file already transcribed for another user - reuse it instead of running the ASR again
+    shared = find_shared_transcript(file_hash)
     
-    if existing_meeting_id:
-        # Delete the newly uploaded duplicate file
-        os.remove(temp_file_path)
-        
-        # Get existing transcript
-        transcripts = load_transcripts()
-        existing_transcript_data = transcripts.get(current_user_id, {}).get(existing_meeting_id, {})
-        # Handle both old format (string) and new format (dict with 'transcript' key)
-        if isinstance(existing_transcript_data, dict):
-            existing_transcript = existing_transcript_data.get('transcript', "No transcript available")
-        else:
-            existing_transcript = existing_transcript_data if existing_transcript_data else "No transcript available"
-        
-        # Get existing meeting info
-        audios = load_audios()
-        existing_meeting = audios.get(current_user_id, {}).get(existing_meeting_id, {})
+    # Otherwise record the meeting as pending; the transcript is generated in the background
+    meeting_id = str(uuid.uuid4())
+    if shared:
+        transcript, asr_model = shared
+        status = 'done'
+    else:
+        transcript, asr_model = "Transcript generation in progress...", None
+        status = 'pending'
+    
+    with DATA_LOCK:
+        # Save transcript with username for easy identification
+        # (copy the cached dicts we modify so concurrent readers never see partial updates)
+        transcripts = dict(load_transcripts())
+        transcripts[current_user_id] = dict(transcripts.get(current_user_id, {}))
+        transcripts[current_user_id][meeting_id] = {
+            'username': current_username,  # Added username for easy identification
+            'transcript': transcript,
+            'meeting_name': meeting_name,
+            'status': status
+        }
+        if asr_model:
+            transcripts[current_user_id][meeting_id]['asr_model'] = asr_model
+        save_transcripts(transcripts)
         
-        print(f"⚠️ Duplicate file detected for user {current_username}. Using existing transcript.")
+        # Update audio metadata with file hash and username
+        previous_audios = load_audios()
+        audios = dict(previous_audios)
+        audios[current_user_id] = dict(audios.get(current_user_id, {}))
         
+        audios[current_user_id][meeting_id] = {
+            'username': current_username,  # Added username for easy identification
+            'meeting_name': meeting_name,
+            'filename': unique_filename,
+            'upload_date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'file_hash': file_hash,  # Store hash to detect future duplicates
+            'hash_algo': FILE_HASH_ALGO,
+            'content_sha256': sha256.hexdigest()
+        }
+        save_audios(audios)
+        update_audio_hash_index(previous_audios, audios, current_user_id, meeting_id)
+    
+    if shared:
+        print(f"♻️ Reusing existing transcript of identical audio for user {current_username}.")
         return jsonify({
-            'message': 'This audio file already exists. Showing existing transcript.',
-            'transcript': existing_transcript,
-            'meeting_id': existing_meeting_id,
-            'meeting_name': existing_meeting.get('meeting_name', 'Untitled Meeting'),
-            'is_duplicate': True
-        }), 200
+            'message': 'Audio uploaded and transcribed successfully',
+            'meeting_id': meeting_id,
+            'meeting_name': meeting_name,
+            'filename': unique_filename,
+            'transcript': transcript,
+            'status': status
+        }), 201
+    
+    record = queue_transcription(current_user_id, current_username, meeting_id, file_path)
+    if record:
+        # Client didn't ask for async - answer with the finished transcript
+        return jsonify({
+            'message': 'Audio uploaded and transcribed successfully',
+            'meeting_id': meeting_id,
+            'meeting_name': meeting_name,
+            'filename': unique_filename,
+            'transcript': record.get('transcript', ''),
+            'status': record.get('status', 'done')
+        }), 201
     
-    # Not a duplicate - proceed with transcription
-    file_path = temp_file_path
-    meeting_id = str(uuid.uuid4())
+    # Client polls /api/meeting/<meeting_id> until status is no longer 'pending'
+    return jsonify({
+        'message': 'Audio uploaded. Transcription started.',
+        'meeting_id': meeting_id,
+        'meeting_name': meeting_name,
+        'filename': unique_filename,
+        'transcript': transcript,
+        'status': 'pending'
+    }), 202
+
+
+def duplicate_upload_response(current_user_id, current_username, existing_meeting_id, existing_meeting):
+    """Build the upload response for a file the user already uploaded (meeting info comes from the duplicate lookup)"""
+    # Get existing transcript
+    existing_transcript_data = load_transcripts().get(current_user_id, {}).get(existing_meeting_id, {})
+    # Handle both old format (string) and new format (dict with 'transcript' key)
+    if isinstance(existing_transcript_data, dict):
+        existing_transcript = existing_transcript_data.get('transcript', "No transcript available")
+        existing_status = existing_transcript_data.get('status', 'done')
+    else:
+        existing_transcript = existing_transcript_data if existing_transcript_data else "No transcript available"
+        existing_status = 'done'
+    
+    # The earlier transcription of this file failed - try it again instead of showing the error forever
+    file_path = os.path.join(UPLOADS_DIR, current_user_id, existing_meeting.get('filename', ''))
+    if existing_status == 'error' and existing_meeting.get('filename') and os.path.isfile(file_path):
+        existing_transcript, existing_status = "Transcript generation in progress...", 'pending'
+        with DATA_LOCK:
+            transcripts = dict(load_transcripts())
+            user_transcripts = dict(transcripts.get(current_user_id, {}))
+            record = dict(user_transcripts.get(existing_meeting_id, {}))
+            record.update(transcript=existing_transcript, status=existing_status)
+            user_transcripts[existing_meeting_id] = record
+            transcripts[current_user_id] = user_transcripts
+            save_transcripts(transcripts)
+        print(f"🔁 Retrying failed transcription for user {current_username}.")
+        record = queue_transcription(current_user_id, current_username, existing_meeting_id, file_path)
+        if record:
+            existing_transcript = record.get('transcript', existing_transcript)
+            existing_status = record.get('status', existing_status)
+    
+    print(f"⚠️ Duplicate file detected for user {current_username}. Using existing transcript.")
     
-    # Generate transcript
-    transcript = "Transcript generation in progress..."
+    return jsonify({
+        'message': 'This audio file already exists. Showing existing transcript.',
+        'transcript': existing_transcript,
+        'meeting_id': existing_meeting_id,
+        'meeting_name': existing_meeting.get('meeting_name', 'Untitled Meeting'),
+        'is_duplicate': True,
+        'status': existing_status
+    }), 200
+
+
+def transcribe_meetings(jobs):
+    """
+    Background job: transcribe a batch of uploaded files and store all results in one write.
+    Identical files in the batch are transcribed once, and files another upload finished
+    transcribing while they were queued reuse that transcript.
+    """
+    asr_model = None
     try:
         asr = get_transcriber()
         print(f"🔍 ASR instance: {asr}")
         if asr:
             print(f"🔍 ASR model loaded: {asr.asr_model is not None}")
         if asr and asr.asr_model:
-            print(f"🎤 Transcribing audio for user {current_username}...")
-            transcript = asr.transcribe(file_path)
-            print(f"✅ Transcription complete! Length: {len(transcript)}")
+            results = [None] * len(jobs)
+            failed = [False] * len(jobs)
+            by_content = {}  # file hash (or path if unhashed) -> indexes of jobs with that file
+            audios = load_audios()
+            for i, (current_user_id, _, meeting_id, file_path) in enumerate(jobs):
+                meeting_info = audios.get(current_user_id, {}).get(meeting_id, {})
+                file_hash = meeting_info.get('file_hash') if meeting_info.get('hash_algo') == FILE_HASH_ALGO else None
+                shared = find_shared_transcript(file_hash) if file_hash else None
+                if shared:
+                    results[i] = shared[0]
+                else:
+                    by_content.setdefault(file_hash or file_path, []).append(i)
+            
+            groups = list(by_content.values())
+            print(f"🎤 Transcribing {len(groups)} audio file(s) for {', '.join(sorted({job[1] for job in jobs}))}...")
+            if groups:
+                transcribed = asr.transcribe_batch([jobs[indexes[0]][3] for indexes in groups])
+                for indexes, transcript in zip(groups, transcribed):
+                    # A file that failed comes back as its TranscriptionError
+                    is_error = isinstance(transcript, Exception)
+                    for i in indexes:
+                        results[i] = str(transcript) if is_error else transcript
+                        failed[i] = is_error
+            asr_model = asr.model_version
+            print(f"✅ Transcription complete! Lengths: {[len(t) for t in results]}")
         else:
-            transcript = "Transcription service unavailable. Model not loaded."
+            results = ["Transcription service unavailable. Model not loaded."] * len(jobs)
+            failed = [True] * len(jobs)
             print("⚠️ ASR model not available")
     except Exception as e:
-        transcript = f"Error during transcription: {str(e)}"
+        results = [f"Error during transcription: {str(e)}"] * len(jobs)
+        failed = [True] * len(jobs)
         print(f"❌ Transcription error: {str(e)}")
-        import traceback
         traceback.print_exc()
     
-    # Save transcript with username for easy identification
-    transcripts = load_transcripts()
-    if current_user_id not in transcripts:
-        transcripts[current_user_id] = {}
-    transcripts[current_user_id][meeting_id] = {
-        'username': current_username,  # Added username for easy identification
-        'transcript': transcript,
-        'meeting_name': meeting_name
-    }
-    save_transcripts(transcripts)
-    
-    # Update audio metadata with file hash and username
-    audios = load_audios()
-    if current_user_id not in audios:
-        audios[current_user_id] = {}
-    
-    audios[current_user_id][meeting_id] = {
-        'username': current_username,  # Added username for easy identification
-        'meeting_name': meeting_name,
-        'filename': unique_filename,
-        'upload_date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        'file_hash': file_hash  # Store hash to detect future duplicates
-    }
-    save_audios(audios)
-    
-    return jsonify({
-        'message': 'Audio uploaded and transcribed successfully',
-        'meeting_id': meeting_id,
-        'meeting_name': meeting_name,
-        'filename': unique_filename,
-        'transcript': transcript
-    }), 201
+    with DATA_LOCK:
+        transcripts = dict(load_transcripts())
+        for (current_user_id, _, meeting_id, _), transcript, job_failed in zip(jobs, results, failed):
+            user_transcripts = dict(transcripts.get(current_user_id, {}))
+            record = dict(user_transcripts.get(meeting_id, {}))
+            record['transcript'] = transcript
+            record['status'] = 'error' if job_failed else 'done'
+            if asr_model and not job_failed:
+                record['asr_model'] = asr_model  # Marks the transcript as reusable for identical uploads
+            user_transcripts[meeting_id] = record
+            transcripts[current_user_id] = user_transcripts
+        save_transcripts(transcripts)
+    notify_transcription_waiters([meeting_id for _, _, meeting_id, _ in jobs])
 
 
 @app.route('/api/user_audios', methods=['GET'])
@@ -456,34 +996,50 @@ def get_user_audios(current_user_id, current_username):
     return jsonify({'audio_files': user_audios}), 200
 
 
-@app.route('/api/user_meetings', methods=['GET'])
-@token_required
-def get_user_meetings(current_user_id, current_username):
-    """Get all meetings with transcripts for authenticated user"""
-    audios = load_audios()
-    transcripts = load_transcripts()
-    
-    user_meetings = audios.get(current_user_id, {})
-    user_transcripts = transcripts.get(current_user_id, {})
+def iter_user_meetings(user_id):
+    """Yield each of a user's meetings with its transcript, as returned by the meetings endpoints"""
+    user_meetings = load_audios().get(user_id, {})
+    user_transcripts = load_transcripts().get(user_id, {})
     
-    meetings = []
     for meeting_id, meeting_info in user_meetings.items():
         # Handle both old format (string) and new format (dict)
         transcript_data = user_transcripts.get(meeting_id, {})
         if isinstance(transcript_data, dict):
             transcript = transcript_data.get('transcript', 'No transcript available')
+            status = transcript_data.get('status', 'done')
         else:
             transcript = transcript_data if transcript_data else 'No transcript available'
+            status = 'done'
         
-        meetings.append({
+        yield {
             'meeting_id': meeting_id,
             'meeting_name': meeting_info.get('meeting_name', 'Untitled Meeting'),
             'filename': meeting_info.get('filename', ''),
             'upload_date': meeting_info.get('upload_date', ''),
-            'transcript': transcript
-        })
+            'transcript': transcript,
+            'status': status
+        }
+
+
+@app.route('/api/user_meetings', methods=['GET'])
+@token_required
+def get_user_meetings(current_user_id, current_username):
+    """Get all meetings with transcripts for authenticated user"""
+    return jsonify({'meetings': list(iter_user_meetings(current_user_id))}), 200
+
+
+@app.route('/api/user_meetings_stream', methods=['GET'])
+@token_required
+def stream_user_meetings(current_user_id, current_username):
+    """
+    Same meetings as /api/user_meetings, streamed as newline-delimited JSON (one meeting per line)
+    so long transcript lists are never encoded into a single response body
+    """
+    def generate_lines():
+        for meeting in iter_user_meetings(current_user_id):
+            yield app.json.dumps(meeting) + '\n'
     
-    return jsonify({'meetings': meetings}), 200
+    return Response(generate_lines(), mimetype='application/x-ndjson')
 
 
 @app.route('/api/meeting/<meeting_id>', methods=['GET'])
@@ -505,30 +1061,58 @@ def get_meeting(current_user_id, current_username, meeting_id):
     transcript_data = user_transcripts.get(meeting_id, {})
     if isinstance(transcript_data, dict):
         transcript = transcript_data.get('transcript', 'No transcript available')
+        status = transcript_data.get('status', 'done')
     else:
         transcript = transcript_data if transcript_data else 'No transcript available'
+        status = 'done'
     
     return jsonify({
         'meeting_id': meeting_id,
         'meeting_name': meeting_info.get('meeting_name', 'Untitled Meeting'),
         'filename': meeting_info.get('filename', ''),
         'upload_date': meeting_info.get('upload_date', ''),
-        'transcript': transcript
+        'transcript': transcript,
+        'status': status
     }), 200
 
 
+@app.route('/api/meeting/<meeting_id>/status', methods=['GET'])
+@token_required
+def get_meeting_status(current_user_id, current_username, meeting_id):
+    """Get only the transcription status of a meeting (polled while it is 'pending')"""
+    if meeting_id not in load_audios().get(current_user_id, {}):
+        return jsonify({'error': 'Meeting not found'}), 404
+    
+    transcript_data = load_transcripts().get(current_user_id, {}).get(meeting_id, {})
+    status = transcript_data.get('status', 'done') if isinstance(transcript_data, dict) else 'done'
+    
+    return jsonify({'meeting_id': meeting_id, 'status': status}), 200
+
+
 @app.route('/api/audio/<filename>', methods=['GET'])
 @token_required
 def serve_audio(current_user_id, current_username, filename):
     """Serve audio file for authenticated user"""
     user_upload_dir = os.path.join(UPLOADS_DIR, current_user_id)
     
-    # Check if file exists in user's directory
-    file_path = os.path.join(user_upload_dir, filename)
-    if not os.path.exists(file_path):
+    # Reject paths that escape the user's directory
+    file_path = safe_join(user_upload_dir, filename)
+    if file_path is None:
         return jsonify({'error': 'File not found'}), 404
     
-    return send_from_directory(user_upload_dir, filename)
+    if AUDIO_SENDFILE == 'nginx':
+        # nginx serves the bytes from an internal location mapped to UPLOADS_DIR and 404s missing files itself
+        # (it URL-decodes the redirect, so quote names with spaces or '%')
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{AUDIO_ACCEL_PREFIX}/{current_user_id}/{quote(filename)}"
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        return response
+    
+    # send_file stats the file once and answers If-None-Match / Range requests from that
+    try:
+        return send_file(file_path, conditional=True, etag=True)
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found'}), 404
 
 
 @app.route('/api/chat', methods=['POST'])
@@ -551,6 +1135,19 @@ def chat_with_ollama(current_user_id, current_username):
     if is_strict_greeting(question):
         return jsonify({'answer': get_greeting_response()}), 200
     
+    # Stream the answer as Server-Sent Events when the client asks for it:
+    # data: {"token": "..."} per chunk, or data: {"error": "..."}; the stream ends after the answer
+    if data.get('stream'):
+        def generate_events():
+            for event in ask_ollama_stream(transcript, question, chat_history, model_name):
+                yield f"data: {app.json.dumps(event)}\n\n"
+        
+        return Response(
+            stream_with_context(generate_events()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
     # Ask Ollama (imported from chatbot.py)
     response = ask_ollama(transcript, question, chat_history, model_name)
     
@@ -567,21 +1164,60 @@ BOT_MEETINGS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'bot_meeting
 
 def load_bot_meetings():
     """Load bot meetings mapping"""
-    if os.path.exists(BOT_MEETINGS_FILE):
-        try:
-            with open(BOT_MEETINGS_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-    return {}
+    return load_json_cached(BOT_MEETINGS_FILE)
 
 def save_bot_meetings(bot_meetings):
     """Save bot meetings mapping. Ensure data directory exists before writing."""
-    os.makedirs(os.path.dirname(BOT_MEETINGS_FILE), exist_ok=True)
-    with open(BOT_MEETINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(bot_meetings, f, indent=2, ensure_ascii=False)
+    save_json_cached(BOT_MEETINGS_FILE, bot_meetings)
+
+
+# Webhook transcripts waiting to be written: (user_id, meeting_id, transcript record).
+# A burst of bot completions is coalesced into one transcripts.json rewrite.
+TRANSCRIPT_FLUSH_INTERVAL = 0.25  # seconds
+pending_transcripts = []
+pending_transcripts_lock = threading.Lock()
+pending_transcripts_event = threading.Event()
+
+
+def queue_transcript_save(user_id, meeting_id, record):
+    """Queue a transcript record for the next batched save"""
+    with pending_transcripts_lock:
+        pending_transcripts.append((user_id, meeting_id, record))
+    pending_transcripts_event.set()
+
+
+def flush_pending_transcripts():
+    """Write every queued transcript record in a single save"""
+    with pending_transcripts_lock:
+        updates = pending_transcripts[:]
+        pending_transcripts.clear()
+    if not updates:
+        return
+    
+    with DATA_LOCK:
+        transcripts = dict(load_transcripts())
+        for user_id, meeting_id, record in updates:
+            transcripts[user_id] = dict(transcripts.get(user_id, {}))
+            transcripts[user_id][meeting_id] = record
+        save_transcripts(transcripts)
+    print(f"💾 Saved {len(updates)} webhook transcript(s)")
+
+
+def transcript_flush_worker():
+    """Background thread: flush queued transcripts at most every TRANSCRIPT_FLUSH_INTERVAL"""
+    while True:
+        pending_transcripts_event.wait()
+        time.sleep(TRANSCRIPT_FLUSH_INTERVAL)
+        pending_transcripts_event.clear()
+        try:
+            flush_pending_transcripts()
+        except Exception as e:
+            print(f"❌ Transcript flush error: {e}")
+
+
+threading.Thread(target=transcript_flush_worker, daemon=True).start()
+# Don't lose queued transcripts on a clean shutdown
+atexit.register(flush_pending_transcripts)
 
 
 @app.route('/api/record_meeting', methods=['POST'])
@@ -596,7 +1232,7 @@ def record_meeting(current_user_id, current_username):
         return jsonify({'error': 'Meeting URL is required'}), 400
     
     # Validate meeting URL format
-    if not any(platform in meeting_url.lower() for platform in ['zoom.us', 'meet.google.com', 'teams.microsoft.com']):
+    if not MEETING_PLATFORM_PATTERN.search(meeting_url):
         return jsonify({'error': 'Invalid meeting URL. Must be Zoom, Google Meet, or Microsoft Teams'}), 400
     
     # Create MeetingBaas bot
@@ -606,16 +1242,17 @@ def record_meeting(current_user_id, current_username):
         return jsonify({'error': result.get('message', 'Failed to create bot')}), 500
     
     # Store bot_id with user info
-    bot_meetings = load_bot_meetings()
     bot_id = result['bot_id']
-    bot_meetings[bot_id] = {
-        'user_id': current_user_id,
-        'username': current_username,
-        'meeting_name': meeting_name,
-        'meeting_url': meeting_url,
-        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
-    }
-    save_bot_meetings(bot_meetings)
+    with DATA_LOCK:
+        bot_meetings = dict(load_bot_meetings())
+        bot_meetings[bot_id] = {
+            'user_id': current_user_id,
+            'username': current_username,
+            'meeting_name': meeting_name,
+            'meeting_url': meeting_url,
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat()
+        }
+        save_bot_meetings(bot_meetings)
     
     return jsonify({
         'message': result['message'],
@@ -685,23 +1322,16 @@ def meetingbaas_webhook():
                 transcript_result = get_transcript(bot_id)
                 
                 if transcript_result['success']:
-                    # Save transcript
-                    transcripts = load_transcripts()
-                    
-                    if user_id not in transcripts:
-                        transcripts[user_id] = {}
-                    
-                    transcripts[user_id][bot_id] = {
+                    # Save transcript (batched with other webhook deliveries)
+                    queue_transcript_save(user_id, bot_id, {
                         'transcript': transcript_result['transcript'],
                         'meeting_name': bot_info['meeting_name'],
                         'created_at': datetime.datetime.now().isoformat(),
                         'source': 'meetingbaas_webhook',
                         'speakers': transcript_result.get('speakers', [])
-                    }
-                    
-                    save_transcripts(transcripts)
+                    })
                     
-                    print(f"✅ Transcript saved successfully!")
+                    print(f"✅ Transcript queued for saving!")
                     print(f"   User: {user_id}")
                     print(f"   Speakers: {', '.join(transcript_result.get('speakers', []))}")
                 else:
@@ -716,7 +1346,6 @@ def meetingbaas_webhook():
         
     except Exception as e:
         print(f"❌ Webhook error: {str(e)}")
-        import traceback
         traceback.print_exc()
         # Still return 200 to prevent webhook retries
         return jsonify({'success': False, 'error': str(e)}), 200
@@ -740,20 +1369,19 @@ def fetch_transcript_manual(current_user_id, current_username, bot_id):
         return jsonify({'error': result.get('message', 'Failed to get transcript')}), 500
     
     # Save transcript to transcripts.json
-    transcripts = load_transcripts()
-    
-    if current_user_id not in transcripts:
-        transcripts[current_user_id] = {}
-    
-    transcripts[current_user_id][bot_id] = {
-        'transcript': result['transcript'],
-        'meeting_name': bot_info['meeting_name'],
-        'created_at': datetime.datetime.now().isoformat(),
-        'source': 'meetingbaas_manual',
-        'speakers': result.get('speakers', [])
-    }
-    
-    save_transcripts(transcripts)
+    with DATA_LOCK:
+        transcripts = dict(load_transcripts())
+        transcripts[current_user_id] = dict(transcripts.get(current_user_id, {}))
+        
+        transcripts[current_user_id][bot_id] = {
+            'transcript': result['transcript'],
+            'meeting_name': bot_info['meeting_name'],
+            'created_at': datetime.datetime.now().isoformat(),
+            'source': 'meetingbaas_manual',
+            'speakers': result.get('speakers', [])
+        }
+        
+        save_transcripts(transcripts)
     
     return jsonify({
         'success': True,
@@ -800,8 +1428,11 @@ def serve_react(path):
 
 
 if __name__ == '__main__':
+    # Development server - in production run `gunicorn app:app` (see gunicorn.conf.py)
     # Start automatic transcript fetcher (polls every 30 seconds)
     start_auto_fetch()
+    # Pick up uploads that were still waiting for transcription when the server stopped
+    requeue_pending_transcriptions()
     
     # Get port from environment (Render sets PORT env var)
     port = int(os.getenv('PORT', 5000))
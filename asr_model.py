@@ -2,15 +2,15 @@
 Echo Note: Whisper + Speaker Diarization Model
 """
 import torch
-import librosa
 import numpy as np
 import whisper
 import os
+from itertools import groupby
 
 # Try to import speaker diarization - make it optional
 try:
     from speechbrain.pretrained import EncoderClassifier
-    from sklearn.cluster import AgglomerativeClustering
+    from sklearn.cluster import AgglomerativeClustering, KMeans
     DIARIZATION_AVAILABLE = True
 except Exception as e:
     print(f"⚠️ Speaker diarization not available: {e}")
@@ -18,17 +18,40 @@ except Exception as e:
 
 # ------------------- CONFIG -------------------
 SAMPLE_RATE = 16000
+WHISPER_MODEL = "base"
+# CPU threads for PyTorch (0 keeps its default of one per core). Lower it to leave
+# cores for the web server when several workers each run a model.
+TORCH_THREADS = int(os.getenv("ASR_TORCH_THREADS", "0"))
+# Speaker chunks embedded per classifier forward pass
+EMBEDDING_BATCH_SIZE = 16
+# Above this many segments, cluster speakers with k-means instead of agglomerative
+# clustering (which needs O(N^2) memory for the pairwise distances)
+AGGLOMERATIVE_MAX_SEGMENTS = 300
+# Recordings shorter than this (or with at most MIN_DIARIZATION_SEGMENTS segments)
+# are labelled as one speaker without running the speaker model
+MIN_DIARIZATION_SECONDS = 15
+MIN_DIARIZATION_SEGMENTS = 2
 
 # ------------------- TRANSCRIPTION CLASS -------------------
+class TranscriptionError(Exception):
+    """Raised when an audio file can't be transcribed (message is shown to the user)"""
+
+
 class ASRTranscriber:
     def __init__(self, model_path=None, device=None):
         """
         Initialize Whisper + Speaker Diarization
         Note: model_path is kept for compatibility but Whisper loads its own models
         """
-        self.device = device if device else torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = torch.device(device) if device else torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        if TORCH_THREADS > 0:
+            torch.set_num_threads(TORCH_THREADS)
+        # Half precision only pays off (and is only supported by Whisper) on CUDA
+        self.use_fp16 = self.device.type == "cuda"
         self.asr_model = None
         self.classifier = None
+        # Identifies which models produced a transcript (transcripts are reused across uploads of the same file)
+        self.model_version = None
         
         self.load_model()
     
@@ -36,14 +59,17 @@ class ASRTranscriber:
         """Load Whisper and Speaker Diarization models"""
         try:
             print("Loading Whisper model...")
-            self.asr_model = whisper.load_model("base")
+            self.asr_model = whisper.load_model(WHISPER_MODEL, device=self.device)
             print("✅ Whisper model loaded.\n")
             
             # Load speaker classifier only if diarization is available
             if DIARIZATION_AVAILABLE:
                 try:
                     print("Loading speaker diarization model...")
-                    self.classifier = EncoderClassifier.from_hparams(source="speechbrain/spkrec-ecapa-voxceleb")
+                    self.classifier = EncoderClassifier.from_hparams(
+                        source="speechbrain/spkrec-ecapa-voxceleb",
+                        run_opts={"device": str(self.device)}
+                    )
                     print("✅ Speaker diarization model loaded.\n")
                 except Exception as e:
                     print(f"⚠️ Speaker diarization unavailable: {e}")
@@ -52,6 +78,7 @@ class ASRTranscriber:
                 self.classifier = None
                 print("⚠️ Running without speaker diarization.\n")
             
+            self.model_version = f"whisper-{WHISPER_MODEL}" + ("+ecapa" if self.classifier is not None else "")
             return True
             
         except Exception as e:
@@ -60,90 +87,144 @@ class ASRTranscriber:
             self.classifier = None
             return False
     
+    def warmup(self):
+        """Run Whisper once on a second of silence so first-call setup costs are paid up front"""
+        if self.asr_model is None:
+            return
+        try:
+            self.asr_model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), verbose=None, fp16=self.use_fp16)
+            print("✅ Whisper warm-up complete.\n")
+        except Exception as e:
+            print(f"⚠️ Whisper warm-up failed: {e}")
+    
+    def transcribe_batch(self, audio_paths):
+        """
+        Transcribe several audio files in one call
+        
+        Whisper's transcribe() decodes one file at a time, so files run back to back on the
+        already-loaded models; callers still save per-batch work such as storage writes.
+        A file that fails doesn't stop the batch - its entry is the TranscriptionError.
+        """
+        results = []
+        for audio_path in audio_paths:
+            try:
+                results.append(self.transcribe(audio_path))
+            except TranscriptionError as e:
+                results.append(e)
+        return results
+    
+    def encode_chunks(self, chunks):
+        """
+        Speaker embeddings for a list of audio chunks, L2-normalised, shape [N, D]
+        
+        Chunks are zero-padded into batches of EMBEDDING_BATCH_SIZE (with relative lengths so
+        padding is ignored), so the classifier runs one forward pass per batch, not per chunk.
+        """
+        embeddings = []
+        for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+            batch = chunks[i:i + EMBEDDING_BATCH_SIZE]
+            if len(batch) == 1:
+                # Nothing to pad - wrap the float32 slice of the decoded audio without copying it
+                wavs = torch.from_numpy(np.ascontiguousarray(batch[0], dtype=np.float32)).unsqueeze(0)
+                wav_lens = torch.ones(1)
+            else:
+                max_len = max(len(chunk) for chunk in batch)
+                wavs = torch.zeros(len(batch), max_len, dtype=torch.float32)
+                for j, chunk in enumerate(batch):
+                    wavs[j, :len(chunk)] = torch.from_numpy(chunk)
+                wav_lens = torch.tensor([len(chunk) / max_len for chunk in batch], dtype=torch.float32)
+            with torch.no_grad():
+                emb = self.classifier.encode_batch(wavs.to(self.device), wav_lens.to(self.device))
+            embeddings.append(emb.squeeze(1).cpu().numpy())
+        
+        embeddings = np.concatenate(embeddings)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+        return embeddings
+    
+    def format_diarized(self, segments, labels):
+        """Format Final Diarized Transcript (merge same speakers) from segments and their 0-based speaker labels"""
+        # Consecutive segments by the same speaker become one paragraph
+        output_lines = []
+        for speaker, group in groupby(zip(labels, segments), key=lambda pair: pair[0]):
+            paragraph = " ".join(seg['text'].strip() for _, seg in group).strip()
+            output_lines.append(f"Speaker {speaker + 1}: {paragraph}\n")
+        
+        # Add summary footer
+        output_lines.append(f"\n[Total Speakers: {len(set(labels))}]")
+        
+        return "\n".join(output_lines)
+    
     def transcribe(self, audio_path):
-        """Transcribe audio file with speaker diarization"""
+        """
+        Transcribe audio file with speaker diarization
+        
+        Raises:
+            TranscriptionError: If the model isn't loaded or the file can't be transcribed
+        """
+        if self.asr_model is None:
+            raise TranscriptionError("Error: Whisper model not loaded. Please check installation.")
+        
         try:
-            if self.asr_model is None:
-                return "Error: Whisper model not loaded. Please check installation."
-            
             # --- Load Audio ---
-            y, sr = librosa.load(audio_path, sr=SAMPLE_RATE, mono=True)
+            # Decoded once (16 kHz mono float32) and shared by Whisper and the speaker chunks
+            y = whisper.load_audio(audio_path, sr=SAMPLE_RATE)
+            sr = SAMPLE_RATE
             print(f"✅ Loaded {audio_path} ({len(y)/sr:.2f}s)\n")
             
             # --- Transcribe ---
             print("🔹 Transcribing with Whisper...")
-            result = self.asr_model.transcribe(audio_path, verbose=False)
+            result = self.asr_model.transcribe(y, verbose=False, fp16=self.use_fp16)
             segments = result["segments"]
             text = result["text"]
             print("\n📝 Transcript:")
             print(text)
             
-            # If no segments or no classifier, return plain text
-            if not segments or self.classifier is None:
-                if self.classifier is None:
-                    print("⚠️ Speaker diarization unavailable, returning plain transcript.\n")
+            # No segments - return the plain text before the single-speaker shortcut below,
+            # which would turn an empty segment list into "[Total Speakers: 0]"
+            if not segments:
+                return text or "Unable to transcribe audio."
+            
+            # No classifier - return plain text
+            if self.classifier is None:
+                print("⚠️ Speaker diarization unavailable, returning plain transcript.\n")
                 return text if text else "Unable to transcribe audio."
             
+            # Too short to tell speakers apart - skip the embedding and clustering passes
+            if len(y) / sr < MIN_DIARIZATION_SECONDS or len(segments) <= MIN_DIARIZATION_SEGMENTS:
+                print("ℹ️ Short recording, treating it as a single speaker.\n")
+                return self.format_diarized(segments, [0] * len(segments))
+            
             # --- Speaker Embeddings ---
-            embeddings, valid_segments = [], []
+            chunks, valid_segments = [], []
             print("\n🔹 Extracting speaker embeddings...")
             for s in segments:
                 start, end = int(s["start"]*sr), int(s["end"]*sr)
                 chunk = y[start:end]
                 if len(chunk)/sr < 1.0: 
                     continue
-                wav_tensor = torch.tensor(chunk, dtype=torch.float32).unsqueeze(0)
-                with torch.no_grad():
-                    emb = self.classifier.encode_batch(wav_tensor).squeeze().cpu().numpy()
-                    emb /= np.linalg.norm(emb) + 1e-8
-                embeddings.append(emb)
+                chunks.append(chunk)
                 valid_segments.append(s)
             
-            if not embeddings:
+            if not chunks:
                 print("❌ No valid segments for diarization.")
                 return text
             
-            embeddings = np.stack(embeddings)
+            embeddings = self.encode_chunks(chunks)
             print(f"✅ Extracted {len(embeddings)} embeddings.\n")
             
             # --- Cluster Speakers ---
             print("🔹 Clustering speakers...")
             n_speakers = min(4, len(embeddings))
-            clustering = AgglomerativeClustering(n_clusters=n_speakers, metric='cosine', linkage='average')
+            if len(embeddings) <= AGGLOMERATIVE_MAX_SEGMENTS:
+                clustering = AgglomerativeClustering(n_clusters=n_speakers, metric='cosine', linkage='average')
+            else:
+                # Embeddings are L2-normalised, so Euclidean k-means groups them by cosine similarity
+                clustering = KMeans(n_clusters=n_speakers, n_init=4, random_state=0)
             labels = clustering.fit_predict(embeddings)
             print(f"✅ Diarization complete! Detected {len(set(labels))} speakers.\n")
             
-            # --- Format Final Diarized Transcript (merge same speakers) ---
-            output_lines = []
-            
-            current_speaker = None
-            current_text = ""
-            
-            for i, seg in enumerate(valid_segments):
-                speaker_id = labels[i] + 1
-                text = seg['text'].strip()
-                
-                if current_speaker == speaker_id:
-                    # Same speaker continues, append text
-                    current_text += " " + text
-                else:
-                    # New speaker, write previous speaker's paragraph
-                    if current_speaker is not None:
-                        output_lines.append(f"Speaker {current_speaker}: {current_text.strip()}\n")
-                    
-                    # Start new speaker paragraph
-                    current_speaker = speaker_id
-                    current_text = text
-            
-            # Write the last speaker's paragraph
-            if current_speaker is not None:
-                output_lines.append(f"Speaker {current_speaker}: {current_text.strip()}\n")
-            
-            # Add summary footer
-            output_lines.append(f"\n[Total Speakers: {len(set(labels))}]")
-            
-            return "\n".join(output_lines)
+            return self.format_diarized(valid_segments, labels)
             
         except Exception as e:
             print(f"❌ Transcription error: {str(e)}")
-            return f"Error during transcription: {str(e)}"
+            raise TranscriptionError(f"Error during transcription: {str(e)}") from e
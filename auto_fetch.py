@@ -10,9 +10,10 @@ import threading
 import os
 import uuid
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from meetingbaas_integration import check_if_transcript_ready, get_transcript
+from storage import DATA_LOCK, load_json, load_json_cached, save_json_cached
 from dotenv import load_dotenv
-import json
 
 load_dotenv()
 
@@ -21,24 +22,25 @@ BOT_MEETINGS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'bot_meeting
 AUDIOS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'audios.json')
 TRANSCRIPTS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'transcripts.json')
 
-def load_json(filepath):
-    """Load JSON file safely"""
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            pass
-    return {}
+# Seconds between polling rounds
+POLL_INTERVAL = 30
+
+# Per-bot backoff: bot_id -> (monotonic time of the next check, delay after that).
+# A bot that isn't done yet is checked half as often each time, up to MAX_POLL_DELAY.
+MAX_POLL_DELAY = 300
+_bot_backoff = {}
+
+# Bots due for a check are queried this many at a time
+FETCH_WORKERS = 8
 
 
-def save_json(filepath, data):
-    """Save JSON file safely"""
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+def fetch_if_ready(bot_id):
+    """Return get_transcript's result for a finished bot, or None if it isn't done yet"""
+    if not check_if_transcript_ready(bot_id):
+        return None
+    print(f"✅ Meeting ended for bot {bot_id}. Fetching transcript...")
+    # Get transcript directly from MeetingBaas API (no downloads!)
+    return get_transcript(bot_id)
 
 
 def check_transcripts():
@@ -46,12 +48,19 @@ def check_transcripts():
     Poll MeetingBaas for completed bots and fetch transcripts
     NO audio downloads - gets transcript directly via API!
     """
-    bot_meetings = load_json(BOT_MEETINGS_FILE)
-    transcripts = load_json(TRANSCRIPTS_FILE)
-    audios = load_json(AUDIOS_FILE)
+    # Read-only here, so the cached stores are used (unchanged files aren't parsed again)
+    bot_meetings = load_json_cached(BOT_MEETINGS_FILE)
+    transcripts = load_json_cached(TRANSCRIPTS_FILE)
+    audios = load_json_cached(AUDIOS_FILE)
     
-    updated = False
+    # New records are collected here and merged under DATA_LOCK at the end,
+    # so the lock isn't held during MeetingBaas API calls
+    new_transcripts = []
+    new_audios = []
+    fetched_bots = {}
     
+    now = time.monotonic()
+    due = []
     for bot_id, bot_info in list(bot_meetings.items()):
         # Check if transcript exists and is not empty
         meeting_id = bot_info.get('meeting_id')
@@ -66,14 +75,24 @@ def check_transcripts():
         if bot_info.get('transcript_fetched') and transcript_exists:
             continue
         
-        # Check if bot is done and transcript is ready
-        if not check_if_transcript_ready(bot_id):
+        # Still backing off from an earlier "not ready" answer
+        next_check, delay = _bot_backoff.get(bot_id, (0.0, POLL_INTERVAL))
+        if now < next_check:
             continue
-        
-        print(f"✅ Meeting ended for bot {bot_id}. Fetching transcript...")
-        
-        # Get transcript directly from MeetingBaas API (no downloads!)
-        transcript_result = get_transcript(bot_id)
+        due.append((bot_id, bot_info, delay))
+    
+    # Check if bots are done (and fetch their transcripts) concurrently -
+    # the MeetingBaas round trips overlap instead of adding up
+    results = []
+    if due:
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(due))) as executor:
+            results = list(executor.map(fetch_if_ready, [bot_id for bot_id, _, _ in due]))
+    
+    for (bot_id, bot_info, delay), transcript_result in zip(due, results):
+        if transcript_result is None:
+            _bot_backoff[bot_id] = (now + delay, min(delay * 2, MAX_POLL_DELAY))
+            continue
+        _bot_backoff.pop(bot_id, None)
         
         if transcript_result['success']:
             user_id = bot_info['user_id']
@@ -85,10 +104,7 @@ def check_transcripts():
             speakers = transcript_result.get('speakers', [])
             
             # Save transcript
-            if user_id not in transcripts:
-                transcripts[user_id] = {}
-            
-            transcripts[user_id][meeting_id] = {
+            new_transcripts.append((user_id, meeting_id, {
                 'username': username,
                 'transcript': transcript_text,
                 'meeting_name': meeting_name,
@@ -96,27 +112,21 @@ def check_transcripts():
                 'bot_id': bot_id,
                 'speakers': speakers,
                 'fetched_at': datetime.datetime.utcnow().isoformat()
-            }
+            }))
             
             # Save audio metadata
-            if user_id not in audios:
-                audios[user_id] = {}
-            
-            audios[user_id][meeting_id] = {
+            new_audios.append((user_id, meeting_id, {
                 'username': username,
                 'meeting_name': meeting_name,
                 'filename': f'meetingbaas_{bot_id}.txt',
                 'upload_date': datetime.datetime.utcnow().isoformat(),
                 'source': 'meetingbaas_auto',
                 'bot_id': bot_id
-            }
+            }))
             
             # Mark as fetched
-            bot_info['transcript_fetched'] = True
-            bot_info['meeting_id'] = meeting_id
-            bot_meetings[bot_id] = bot_info
+            fetched_bots[bot_id] = meeting_id
             
-            updated = True
             print(f"💾 Saved transcript for {username}: {meeting_name}")
             print(f"📝 Transcript length: {len(transcript_text)} characters")
             if speakers:
@@ -124,14 +134,31 @@ def check_transcripts():
         else:
             print(f"⚠️ Could not fetch transcript for bot {bot_id}: {transcript_result.get('message')}")
     
-    if updated:
-        save_json(TRANSCRIPTS_FILE, transcripts)
-        save_json(AUDIOS_FILE, audios)
-        save_json(BOT_MEETINGS_FILE, bot_meetings)
+    if fetched_bots:
+        with DATA_LOCK:
+            # Reload so changes made by request handlers since the poll started are kept
+            # (fresh, uncached copies, since they are modified in place below)
+            transcripts = load_json(TRANSCRIPTS_FILE)
+            audios = load_json(AUDIOS_FILE)
+            bot_meetings = load_json(BOT_MEETINGS_FILE)
+            
+            for user_id, meeting_id, record in new_transcripts:
+                transcripts.setdefault(user_id, {})[meeting_id] = record
+            for user_id, meeting_id, record in new_audios:
+                audios.setdefault(user_id, {})[meeting_id] = record
+            for bot_id, meeting_id in fetched_bots.items():
+                bot_info = bot_meetings.get(bot_id, {})
+                bot_info['transcript_fetched'] = True
+                bot_info['meeting_id'] = meeting_id
+                bot_meetings[bot_id] = bot_info
+            
+            save_json_cached(TRANSCRIPTS_FILE, transcripts)
+            save_json_cached(AUDIOS_FILE, audios)
+            save_json_cached(BOT_MEETINGS_FILE, bot_meetings)
 
 def auto_fetch_loop():
-    """Background thread that polls every 30 seconds"""
-    print("🤖 MeetingBaas auto-fetch started! Checking every 30 seconds...")
+    """Background thread that polls every POLL_INTERVAL seconds"""
+    print(f"🤖 MeetingBaas auto-fetch started! Checking every {POLL_INTERVAL} seconds...")
     
     while True:
         try:
@@ -139,7 +166,7 @@ def auto_fetch_loop():
         except Exception as e:
             print(f"❌ Auto-fetch error: {e}")
         
-        time.sleep(30)
+        time.sleep(POLL_INTERVAL)
 
 
 def start_auto_fetch():
@@ -7,11 +7,72 @@ PERFORMANCE OPTIMIZATIONS:
 - Ultra-short prompts for faster processing
 - Quick answers for simple queries (skip AI)
 - 120s timeout for long transcripts
+- Installed-model check cached for 5 minutes (one HTTP call instead of `ollama list`)
 - Efficient Q&A format
+- Streaming variant (ask_ollama_stream) so answers show up as they are generated
+- Questions go to Ollama's HTTP API over a kept-alive connection (no `ollama run` process per question)
+- Repeated questions on the same transcript are answered from an in-memory LRU cache
+  (any phrasing of a summary request shares one entry; summaries are also saved under data/summaries/)
 """
 
-import subprocess
+import json
+import os
 import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+
+import requests
+
+
+# Compiled once at import instead of building a pattern per greeting on every call
+# (any run of whitespace is accepted between words, e.g. "good  morning")
+GREETINGS = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening"]
+GREETING_PATTERN = re.compile(
+    "|".join(r"\s+".join(map(re.escape, greeting.split())) for greeting in GREETINGS),
+    re.IGNORECASE
+)
+
+
+# Robust detection for requests to show the full transcript.
+# Include common phrasings and frequent misspellings so short/typoed user inputs still trigger this.
+SHOW_TRANSCRIPT_KEYWORDS = (
+    "show transcript", "display transcript", "show me the transcript",
+    "display the transcript", "view transcript", "see transcript",
+    "full transcript", "entire transcript", "whole transcript",
+    "read transcript", "give me transcript", "get transcript",
+    "transcript please", "show full",
+    # short forms
+    "transcript", "transcripts",
+    # common misspellings to catch quick typos
+    "transciot", "transcipt", "transciipt",
+)
+# very short requests like "trans" or just "transcript"
+SHORT_TRANSCRIPT_REQUESTS = frozenset({"trans", "transcript", "show trans"})
+# user asks to show/read/view and mentions the 'trans' prefix
+SHOW_VERB_PATTERN = re.compile(r"show|read|view")
+
+ATTENDEES_KEYWORDS = ("who attended", "who was there", "who spoke", "list of speakers")
+SUMMARY_KEYWORDS = ("summary", "summarize", "summarise", "overview")
+
+# All quick-answer keywords in one alternation - a single scan of the question
+# reports every intent it mentions (the group name of each match)
+INTENT_PATTERN = re.compile("|".join(
+    f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})"
+    for intent, keywords in (
+        ("show_transcript", SHOW_TRANSCRIPT_KEYWORDS),
+        ("attendees", ATTENDEES_KEYWORDS),
+        ("summary", SUMMARY_KEYWORDS),
+    )
+))
+SPEAKER_PATTERN = re.compile(r"Speaker (\d+):")
+
+
+def detect_intents(question_lower):
+    """Return the set of intents ('show_transcript', 'attendees', 'summary') named in a lowercased question"""
+    return {match.lastgroup for match in INTENT_PATTERN.finditer(question_lower)}
 
 
 def is_strict_greeting(text):
@@ -24,8 +85,38 @@ def is_strict_greeting(text):
     Returns:
         bool: True if text matches a greeting pattern
     """
-    greetings = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening"]
-    return any(re.fullmatch(rf"\b{greet}\b", text.strip().lower()) for greet in greetings)
+    return GREETING_PATTERN.fullmatch(text.strip()) is not None
+
+
+# Ollama server's HTTP API (the same server the `ollama` CLI talks to)
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+
+# One session for all Ollama calls so the TCP connection is reused between questions
+ollama_session = requests.Session()
+
+# Installed model names are reused for this long before asking Ollama again
+MODEL_LIST_TTL = 300  # seconds
+_model_list_cache = {'names': None, 'lookup': frozenset(), 'expires': 0.0}
+
+
+def get_installed_models(refresh=False):
+    """
+    List installed Ollama model names via GET /api/tags, cached for MODEL_LIST_TTL
+    
+    Raises:
+        requests.RequestException: If Ollama can't be reached
+    """
+    now = time.monotonic()
+    if not refresh and _model_list_cache['names'] is not None and now < _model_list_cache['expires']:
+        return _model_list_cache['names']
+    
+    response = ollama_session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+    response.raise_for_status()
+    names = [model.get('name', '') for model in response.json().get('models', [])]
+    # "llama2" and "llama2:latest" name the same model
+    lookup = frozenset(names) | {name[:-len(':latest')] for name in names if name.endswith(':latest')}
+    _model_list_cache.update(names=names, lookup=lookup, expires=now + MODEL_LIST_TTL)
+    return names
 
 
 def is_model_available(model_name="gemma:2b"):
@@ -39,19 +130,157 @@ def is_model_available(model_name="gemma:2b"):
         bool: True if model is available
     """
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, timeout=5)
-        return model_name in result.stdout
-    except subprocess.TimeoutExpired:
-        print("⚠️ Ollama list command timed out")
+        get_installed_models()
+        if model_name in _model_list_cache['lookup']:
+            return True
+        # Not in the cached list - the model may have been pulled since, so ask again
+        get_installed_models(refresh=True)
+        return model_name in _model_list_cache['lookup']
+    except requests.Timeout:
+        print("⚠️ Ollama model list request timed out")
         return False
     except Exception as e:
         print(f"❌ Could not connect to Ollama: {e}")
         return False
 
 
-def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
+# Longest time an Ollama call may take (long transcripts are slow)
+OLLAMA_TIMEOUT = 120
+OLLAMA_CONNECT_TIMEOUT = 5
+
+TIMEOUT_MESSAGE = 'Request timed out. The model might be processing a complex query. Please try again.'
+NOT_RUNNING_MESSAGE = 'Ollama is not running. Please start it with `ollama serve`.'
+
+# How long Ollama keeps the model loaded after an answer, so follow-up questions
+# don't pay the model load again (Ollama's own default is 5 minutes)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Generations this worker sends to Ollama at once - size it like the server's
+# OLLAMA_NUM_PARALLEL. Further questions wait here (up to OLLAMA_TIMEOUT) instead of
+# piling up in Ollama's queue behind each other.
+OLLAMA_NUM_PARALLEL = max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+_generate_slots = threading.BoundedSemaphore(OLLAMA_NUM_PARALLEL)
+BUSY_MESSAGE = 'The assistant is busy answering other questions. Please try again in a moment.'
+
+
+# Answers to questions already asked about a transcript, most recently used last
+ANSWER_CACHE_MAX = 512
+_answer_cache = OrderedDict()
+_answer_cache_lock = threading.Lock()
+
+
+# Case, repeated whitespace and trailing punctuation don't change the answer
+QUESTION_NOISE_PATTERN = re.compile(r"[\s?!.]+$|^\s+")
+QUESTION_SPACE_PATTERN = re.compile(r"\s+")
+
+# Summary prompts don't include the question, so every way of asking for one
+# ("summarize", "give me an overview", ...) gets the same answer
+SUMMARY_CACHE_QUESTION = "<summary>"
+
+# Summaries are also kept on disk, one file per transcript ({model: summary}),
+# so they survive restarts and are shared between Gunicorn workers
+SUMMARIES_DIR = os.path.join(os.path.dirname(__file__), 'data', 'summaries')
+
+
+def answer_cache_key(model_name, transcript, question, is_summary=False):
+    """Cache key: model, transcript digest (hex) and the normalized question"""
+    digest = blake2b(transcript.encode('utf-8'), digest_size=16).hexdigest()
+    if is_summary:
+        question = SUMMARY_CACHE_QUESTION
+    else:
+        question = QUESTION_SPACE_PATTERN.sub(" ", QUESTION_NOISE_PATTERN.sub("", question.lower()))
+    return (model_name, digest, question)
+
+
+def summary_path(digest):
+    """Summary file for a transcript digest"""
+    return os.path.join(SUMMARIES_DIR, f"{digest}.json")
+
+
+def load_saved_summaries(digest):
+    """Return the saved {model: summary} dict for a transcript digest ({} if none)"""
+    try:
+        with open(summary_path(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Serializes the read -> modify -> write of summary files within this process
+_summary_file_lock = threading.Lock()
+
+
+def save_summary(digest, model_name, summary):
+    """Add a model's summary to the transcript's summary file (written atomically)"""
+    tmp_path = None
+    try:
+        os.makedirs(SUMMARIES_DIR, exist_ok=True)
+        with _summary_file_lock:
+            summaries = load_saved_summaries(digest)
+            summaries[model_name] = summary
+            # Unique temp file in the same directory, so concurrent saves never share one
+            fd, tmp_path = tempfile.mkstemp(dir=SUMMARIES_DIR, prefix=f".{digest}-", suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(summaries, f, ensure_ascii=False)
+            os.replace(tmp_path, summary_path(digest))
+            tmp_path = None
+    except OSError as e:
+        print(f"⚠️ Could not save summary: {e}")
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _remember(key, answer):
+    """Put an answer in the in-memory LRU"""
+    with _answer_cache_lock:
+        _answer_cache[key] = answer
+        _answer_cache.move_to_end(key)
+        if len(_answer_cache) > ANSWER_CACHE_MAX:
+            _answer_cache.popitem(last=False)
+
+
+def get_cached_answer(key):
+    """Return the cached answer for key (or a summary saved on disk), or None"""
+    with _answer_cache_lock:
+        answer = _answer_cache.get(key)
+        if answer is not None:
+            _answer_cache.move_to_end(key)
+            return answer
+    
+    model_name, digest, question = key
+    if question == SUMMARY_CACHE_QUESTION:
+        answer = load_saved_summaries(digest).get(model_name)
+        if answer is not None:
+            _remember(key, answer)
+        return answer
+    return None
+
+
+def cache_answer(key, answer):
+    """Remember an answer, evicting the least recently used one past ANSWER_CACHE_MAX"""
+    _remember(key, answer)
+    model_name, digest, question = key
+    if question == SUMMARY_CACHE_QUESTION:
+        save_summary(digest, model_name, answer)
+
+
+def generate_payload(model_name, prompt, stream):
+    """Request body for Ollama's POST /api/generate"""
+    return {
+        'model': model_name,
+        'prompt': prompt,
+        'stream': stream,
+        'keep_alive': OLLAMA_KEEP_ALIVE,
+    }
+
+
+def build_ollama_prompt(transcript, question, chat_history=None, model_name="gemma:2b"):
     """
-    Ask Ollama a question with meeting transcript context
+    Answer quick queries directly, otherwise build the prompt for Ollama
     
     Args:
         transcript (str): Meeting transcript text
@@ -60,7 +289,8 @@ def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
         model_name (str): Ollama model to use
         
     Returns:
-        dict: {'answer': str} on success, {'error': str} on failure
+        dict: {'prompt': str, 'summary': bool} when the model should be called,
+              otherwise {'answer': str} (quick answer) or {'error': str}
     """
     if chat_history is None:
         chat_history = []
@@ -74,40 +304,18 @@ def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
     # Save original transcript for "show transcript" command
     original_transcript = transcript
     question_lower = question.lower()
+    intents = detect_intents(question_lower)
     
     print(f"🔍 Question received: '{question}'")
     print(f"📄 Original transcript length: {len(original_transcript)} chars")
     
     # Quick answers for simple queries (skip AI processing) - BEFORE truncation
     # Check if user is asking to see the full transcript
-    # Robust detection for requests to show the full transcript.
-    # Include common phrasings and frequent misspellings so short/typoed user inputs still trigger this.
-    show_transcript_keywords = [
-        "show transcript", "display transcript", "show me the transcript",
-        "display the transcript", "view transcript", "see transcript",
-        "full transcript", "entire transcript", "whole transcript",
-        "read transcript", "give me transcript", "get transcript",
-        "transcript please", "show full",
-        # short forms
-        "transcript", "transcripts", "full transcript",
-    ]
-
-    # common misspellings to catch quick typos
-    misspellings = ["transciot", "transcipt", "transcipt", "transciipt", "transcipt", "transciot"]
-
-    should_show = False
-    # direct substring checks
-    if any(keyword in question_lower for keyword in show_transcript_keywords):
-        should_show = True
-    # misspelling matches
-    if any(miss in question_lower for miss in misspellings):
-        should_show = True
-    # very short requests like "trans" or just "transcript"
-    if question_lower.strip() in ("trans", "transcript", "show trans"):
-        should_show = True
-    # fuzzy condition: user asks to show/read and mentions 'trans' prefix
-    if ("show" in question_lower or "read" in question_lower or "view" in question_lower) and "trans" in question_lower:
-        should_show = True
+    should_show = (
+        'show_transcript' in intents
+        or question_lower.strip() in SHORT_TRANSCRIPT_REQUESTS
+        or ("trans" in question_lower and SHOW_VERB_PATTERN.search(question_lower) is not None)
+    )
 
     if should_show:
         print(f"✅ Quick answer: Returning full transcript ({len(original_transcript)} chars)")
@@ -115,12 +323,11 @@ def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
         return {'answer': original_transcript}
     
     # Quick answer for "who attended" or "who was there"
-    if any(phrase in question_lower for phrase in ["who attended", "who was there", "who spoke", "list of speakers"]):
+    if 'attendees' in intents:
         # Extract speaker numbers from transcript
-        import re
-        speakers = re.findall(r'Speaker (\d+):', original_transcript)
-        if speakers:
-            unique_speakers = sorted(set(speakers))
+        # (deduplicated while scanning; numeric order so Speaker 10 comes after Speaker 2)
+        unique_speakers = sorted({match.group(1) for match in SPEAKER_PATTERN.finditer(original_transcript)}, key=int)
+        if unique_speakers:
             return {'answer': f"There were {len(unique_speakers)} speakers in this meeting: Speaker {', Speaker '.join(unique_speakers)}."}
     
     # Now do smart context extraction for AI processing
@@ -128,17 +335,19 @@ def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
     original_length = len(transcript)
     
     # For summaries, use more context; for specific questions, less is fine
-    is_summary = any(word in question_lower for word in ["summary", "summarize", "summarise", "overview"])
+    is_summary = 'summary' in intents
     
     if is_summary:
         # For summaries, take beginning, middle, and end
         if len(transcript) > MAX_TRANSCRIPT_LENGTH:
+            # Sampled pieces are joined in one allocation (chained + copies the growing string each time)
             third = MAX_TRANSCRIPT_LENGTH // 3
-            beginning = transcript[:third]
             middle_start = len(transcript) // 2 - third // 2
-            middle = transcript[middle_start:middle_start + third]
-            end = transcript[-third:]
-            transcript = beginning + "\n[...]\n" + middle + "\n[...]\n" + end
+            transcript = "\n[...]\n".join((
+                transcript[:third],
+                transcript[middle_start:middle_start + third],
+                transcript[-third:],
+            ))
             print(f"📝 Using smart sampling: {original_length} → {len(transcript)} chars")
     else:
         # For specific questions, just use first part (most relevant info usually at start)
@@ -146,12 +355,6 @@ def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
             transcript = transcript[:MAX_TRANSCRIPT_LENGTH]
             print(f"📝 Truncated to {MAX_TRANSCRIPT_LENGTH} chars for faster processing")
     
-    # Build conversational context from history
-    history_context = ""
-    if chat_history:
-        for chat in chat_history:
-            history_context += f"User: {chat['question']}\nAssistant: {chat['answer']}\n\n"
-    
     # Build ultra-efficient prompts
     if is_summary:
         # Minimal prompt for summary
@@ -167,35 +370,187 @@ Q: {question}
 A:"""
         system_msg = "Answer in 1-2 sentences based on transcript only."
     
-    try:
-        # Call Ollama via subprocess
-        command = [
-            "ollama", "run", model_name,
-            f"{system_msg}\n\n{prompt}"
-        ]
+    return {'prompt': f"{system_msg}\n\n{prompt}", 'summary': is_summary}
+
+
+def ask_ollama(transcript, question, chat_history=None, model_name="gemma:2b"):
+    """
+    Ask Ollama a question with meeting transcript context
+    
+    Args:
+        transcript (str): Meeting transcript text
+        question (str): User's question
+        chat_history (list): Previous conversation history [{'question': str, 'answer': str}]
+        model_name (str): Ollama model to use
         
+    Returns:
+        dict: {'answer': str} on success, {'error': str} on failure
+    """
+    request = build_ollama_prompt(transcript, question, chat_history, model_name)
+    if 'prompt' not in request:
+        return request
+    
+    cache_key = answer_cache_key(model_name, transcript, question, request['summary'])
+    cached = get_cached_answer(cache_key)
+    if cached is not None:
+        print(f"⚡ Answer cache hit ({len(cached)} chars)")
+        return {'answer': cached}
+    
+    # Wait for a free generation slot
+    if not _generate_slots.acquire(timeout=OLLAMA_TIMEOUT):
+        print("⏱️ No free Ollama slot")
+        return {'error': BUSY_MESSAGE}
+    try:
         print(f"🤖 Calling Ollama model: {model_name}")
         # Increase timeout for long transcripts (120 seconds)
-        result = subprocess.run(command, capture_output=True, text=True, timeout=120)
+        response = ollama_session.post(
+            f"{OLLAMA_URL}/api/generate",
+            json=generate_payload(model_name, request['prompt'], stream=False),
+            timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_TIMEOUT)
+        )
+        data = response.json()
         
-        if result.returncode == 0:
-            answer = result.stdout.strip()
+        if response.ok and 'error' not in data:
+            answer = data.get('response', '').strip()
             print(f"✅ Ollama response received ({len(answer)} chars)")
+            if answer:
+                cache_answer(cache_key, answer)
             return {'answer': answer}
         else:
-            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            error_msg = data.get('error') or "Unknown error"
             print(f"❌ Ollama error: {error_msg}")
             return {'error': f"Ollama error: {error_msg}"}
             
-    except subprocess.TimeoutExpired:
+    except requests.Timeout:
         print("⏱️ Ollama request timed out")
-        return {'error': 'Request timed out. The model might be processing a complex query. Please try again.'}
-    except FileNotFoundError:
-        print("❌ Ollama not found in system PATH")
-        return {'error': 'Ollama is not installed or not in system PATH. Please install Ollama from https://ollama.com'}
+        return {'error': TIMEOUT_MESSAGE}
+    except requests.ConnectionError:
+        print(f"❌ Ollama server not reachable at {OLLAMA_URL}")
+        return {'error': NOT_RUNNING_MESSAGE}
     except Exception as e:
         print(f"❌ Unexpected error: {str(e)}")
         return {'error': f'Error from Ollama: {str(e)}'}
+    finally:
+        _generate_slots.release()
+
+
+def ask_ollama_stream(transcript, question, chat_history=None, model_name="gemma:2b"):
+    """
+    Ask Ollama a question, yielding the answer as the model generates it
+    
+    Args:
+        Same as ask_ollama
+        
+    Yields:
+        dict: {'token': str} for each piece of the answer, or a single {'error': str}
+    """
+    request = build_ollama_prompt(transcript, question, chat_history, model_name)
+    if 'prompt' not in request:
+        # Quick answers and errors are sent as a single event
+        yield {'token': request['answer']} if 'answer' in request else request
+        return
+    
+    cache_key = answer_cache_key(model_name, transcript, question, request['summary'])
+    cached = get_cached_answer(cache_key)
+    if cached is not None:
+        print(f"⚡ Answer cache hit ({len(cached)} chars)")
+        yield {'token': cached}
+        return
+    
+    # Wait for a free generation slot (held until the stream ends or the client goes away)
+    if not _generate_slots.acquire(timeout=OLLAMA_TIMEOUT):
+        print("⏱️ No free Ollama slot")
+        yield {'error': BUSY_MESSAGE}
+        return
+    try:
+        yield from stream_generate(model_name, request['prompt'], cache_key)
+    finally:
+        _generate_slots.release()
+
+
+def stream_generate(model_name, prompt, cache_key):
+    """
+    Stream an answer from Ollama's /api/generate, caching it once complete
+    
+    Yields:
+        dict: {'token': str} for each piece of the answer, or a single {'error': str}
+    """
+    print(f"🤖 Streaming from Ollama model: {model_name}")
+    deadline = time.monotonic() + OLLAMA_TIMEOUT
+    try:
+        response = ollama_session.post(
+            f"{OLLAMA_URL}/api/generate",
+            json=generate_payload(model_name, prompt, stream=True),
+            timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_TIMEOUT),
+            stream=True
+        )
+    except requests.Timeout:
+        print("⏱️ Ollama request timed out")
+        yield {'error': TIMEOUT_MESSAGE}
+        return
+    except requests.ConnectionError:
+        print(f"❌ Ollama server not reachable at {OLLAMA_URL}")
+        yield {'error': NOT_RUNNING_MESSAGE}
+        return
+    except requests.RequestException as e:
+        print(f"❌ Ollama request failed: {e}")
+        yield {'error': f'Error from Ollama: {str(e)}'}
+        return
+    
+    if not response.ok:
+        # Ollama answers errors (e.g. unknown model) with {"error": "..."}; a proxy in front may not
+        with response:
+            try:
+                error_msg = response.json().get('error') or response.reason
+            except ValueError:
+                error_msg = f"HTTP {response.status_code} {response.reason}"
+        print(f"❌ Ollama error: {error_msg}")
+        yield {'error': f"Ollama error: {error_msg}"}
+        return
+    
+    # Closing the response also runs when the client disconnects mid-stream,
+    # which makes Ollama stop generating
+    with response:
+        pieces = []
+        try:
+            # One JSON object per line: {"response": "...", "done": false}, ... {"done": true}
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Truncated or garbled line - the stream can't be trusted past this point
+                    print(f"❌ Unreadable line from Ollama: {line[:200]!r}")
+                    yield {'error': 'Error from Ollama: received an incomplete response. Please try again.'}
+                    return
+                if 'error' in event:
+                    print(f"❌ Ollama error: {event['error']}")
+                    yield {'error': f"Ollama error: {event['error']}"}
+                    return
+                if event.get('response'):
+                    pieces.append(event['response'])
+                    yield {'token': event['response']}
+                if event.get('done'):
+                    break
+                # Same overall time limit as ask_ollama
+                if time.monotonic() > deadline:
+                    print("⏱️ Ollama request timed out")
+                    yield {'error': TIMEOUT_MESSAGE}
+                    return
+        except requests.Timeout:
+            print("⏱️ Ollama request timed out")
+            yield {'error': TIMEOUT_MESSAGE}
+            return
+        except requests.RequestException as e:
+            print(f"❌ Ollama stream interrupted: {e}")
+            yield {'error': f'Error from Ollama: {str(e)}'}
+            return
+        
+        answer = ''.join(pieces).strip()
+        print(f"✅ Ollama response streamed ({len(answer)} chars)")
+        if answer:
+            cache_answer(cache_key, answer)
 
 
 def get_greeting_response():
@@ -224,14 +579,7 @@ def list_available_models():
         list: Available model names
     """
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            # Parse the output to extract model names
-            lines = result.stdout.strip().split('\n')
-            if len(lines) > 1:  # Skip header
-                models = [line.split()[0] for line in lines[1:] if line.strip()]
-                return models
-        return []
+        return list(get_installed_models())
     except Exception as e:
         print(f"❌ Could not list models: {e}")
         return []
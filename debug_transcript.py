@@ -3,7 +3,8 @@ Debug script to see raw MeetingBaas transcript data
 """
 # meetingbaas is the api we called 
 from meetingbaas_integration import get_transcript
-import json
+import orjson
+import sys
 
 bot_id = "058427fe-c53c-4c7e-b517-4f333c879a3f"
 
@@ -13,7 +14,10 @@ result = get_transcript(bot_id)
 
 print("=" * 60)
 print("RESULT:")
-print(json.dumps(result, indent=2, default=str))
+# Raw meeting_data for a long meeting is several MB - encode it in C and write the bytes directly
+sys.stdout.flush()
+sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str) + b"\n")
+sys.stdout.buffer.flush()
 print("=" * 60)
 
 if result.get('raw_data'):
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for Echo Note
+
+Run with:  gunicorn app:app
+Each worker process loads its own copy of the ASR model, so keep the worker
+count low and scale request concurrency with threads instead.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Workers each hold a Whisper model in memory - override with WEB_CONCURRENCY
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+# Request threads mostly wait on I/O (upload bodies, streamed Ollama answers,
+# MeetingBaas calls) since transcription runs on the background queue
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Uploads of long recordings can take a while to stream in
+timeout = 300
+graceful_timeout = 30
+
+
+def post_worker_init(worker):
+    """
+    Start the MeetingBaas auto-fetcher, and re-queue transcriptions left 'pending'
+    by a restart, in exactly one worker.
+    Not in the master: workers forked from it would inherit the fetcher's locks
+    (possibly held) and its pooled MeetingBaas connections.
+    """
+    from storage import claim_background_jobs
+    from auto_fetch import start_auto_fetch
+    if claim_background_jobs():
+        start_auto_fetch()
+        from app import requeue_pending_transcriptions
+        requeue_pending_transcriptions()
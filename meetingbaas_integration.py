@@ -4,16 +4,31 @@ Handles bot creation, status checking, and transcript retrieval
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
 from dotenv import load_dotenv
 from datetime import datetime
 import uuid
+import orjson
 
 load_dotenv()
 
 MEETINGBAAS_API_KEY = os.getenv('MEETINGBAAS_API_KEY')
 MEETINGBAAS_API_BASE = 'https://api.meetingbaas.com'
 
+# One session for all MeetingBaas calls so TCP/TLS connections are reused.
+# The pool is sized for the concurrent status checks in auto_fetch.
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16
+))
+
+
+def parse_json(response):
+    """Decode a MeetingBaas response body (meeting_data can be several MB for long meetings)"""
+    return orjson.loads(response.content)
+
 
 def create_meeting_bot(meeting_url, meeting_name="Echo Note Bot"):
     """
@@ -54,7 +69,7 @@ def create_meeting_bot(meeting_url, meeting_name="Echo Note Bot"):
     
     try:
         print(f"🔄 Creating MeetingBaas bot for: {meeting_url}")
-        response = requests.post(
+        response = session.post(
             f'{MEETINGBAAS_API_BASE}/bots',
             json=payload,
             headers=headers,
@@ -64,7 +79,7 @@ def create_meeting_bot(meeting_url, meeting_name="Echo Note Bot"):
         print(f"📊 Response Status: {response.status_code}")
         
         if response.status_code in [200, 201]:
-            data = response.json()
+            data = parse_json(response)
             print(f"📄 Full Response: {data}")
             
             bot_id = data.get('id') or data.get('bot_id')
@@ -115,7 +130,7 @@ def get_bot_status(bot_id):
     }
     
     try:
-        response = requests.get(
+        response = session.get(
             f'{MEETINGBAAS_API_BASE}/bots/meeting_data',
             params={'bot_id': bot_id},
             headers=headers,
@@ -123,7 +138,7 @@ def get_bot_status(bot_id):
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             bot_data = data.get('bot_data', {}).get('bot', {})
             
             # Determine status from bot data
@@ -176,7 +191,7 @@ def get_transcript(bot_id):
     
     try:
         # Get meeting data with transcript
-        response = requests.get(
+        response = session.get(
             f'{MEETINGBAAS_API_BASE}/bots/meeting_data',
             params={'bot_id': bot_id},
             headers=headers,
@@ -184,7 +199,7 @@ def get_transcript(bot_id):
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             transcripts = data.get('bot_data', {}).get('transcripts', [])
             
             if not transcripts:
@@ -201,16 +216,16 @@ def get_transcript(bot_id):
                 speaker = segment.get('speaker', 'Unknown Speaker')
                 speakers.add(speaker)
                 
-                # Get all words and combine them with spaces
-                words = segment.get('words', [])
-                text = ' '.join([word.get('text', '').strip() for word in words if word.get('text', '').strip()])
+                # Get all words and combine them with spaces (each word stripped once)
+                words = (word.get('text', '').strip() for word in segment.get('words', ()))
+                text = ' '.join(filter(None, words))
                 
                 # Skip empty segments
                 if not text:
                     continue
                 
                 # Add speaker label and text
-                transcript_parts.append(f"{speaker}: {text.strip()}")
+                transcript_parts.append(f"{speaker}: {text}")
             
             full_transcript = '\n\n'.join(transcript_parts)
             
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react'
+import React, { memo, useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 import "../style/Chatbot.css"
 import Navbar from './Navbar'
@@ -10,6 +10,17 @@ const initialQuestions = [
   "When is the follow-up meeting?"
 ]
 
+// Memoized so typing in the input or streaming into the last answer doesn't
+// re-render every earlier message in the conversation
+const ChatMessage = memo(function ChatMessage({ sender, text, time }) {
+  return (
+    <div className={`chat-message ${sender}`}>
+      <p>{text}</p>
+      <span className="chat-time">{time}</span>
+    </div>
+  );
+});
+
 const Chatbot = () => {
   const navigate = useNavigate();
   const [isLoggedIn, setIsLoggedIn] = useState(false);
@@ -39,7 +50,7 @@ const Chatbot = () => {
 
   const fetchUserMeetings = async (token) => {
     try {
-      const response = await fetch('/api/user_meetings', {
+      const response = await fetch('/api/user_meetings_stream', {
         headers: {
           'Authorization': `Bearer ${token}`
         }
@@ -54,9 +65,25 @@ const Chatbot = () => {
         return;
       }
       
+      // Newline-delimited JSON: one meeting per line, shown as they arrive
       if (response.ok) {
-        const data = await response.json();
-        setMeetings(data.meetings || []);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        const received = [];
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const lines = buffer.split('\n');
+          buffer = lines.pop();
+          const batch = lines.filter(Boolean).map((line) => JSON.parse(line));
+          if (batch.length) {
+            received.push(...batch);
+            setMeetings([...received]);
+          }
+        }
+        setMeetings(received);
       }
     } catch (error) {
       console.error('Error fetching meetings:', error);
@@ -191,8 +218,23 @@ const Chatbot = () => {
   // Hide suggestions after any user action
   const hideSuggestions = () => setSuggestedQuestions([]);
 
-  // Function to call Ollama backend
-  const askOllama = async (question) => {
+  // Bot message that is added on the first streamed chunk and then updated in place
+  const createStreamingMessage = () => {
+    let started = false;
+    const time = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+    const update = (text) => {
+      if (!started) {
+        started = true;
+        setMessages(prev => [...prev, { sender: "bot", text, time }]);
+      } else {
+        setMessages(prev => [...prev.slice(0, -1), { ...prev[prev.length - 1], text }]);
+      }
+    };
+    return { update, isStarted: () => started };
+  };
+
+  // Function to call Ollama backend (onPartial receives the answer so far while it streams)
+  const askOllama = async (question, onPartial) => {
     if (!selectedTranscript) {
       return "Please select a meeting from the dropdown above to start asking questions.";
     }
@@ -249,7 +291,8 @@ const Chatbot = () => {
           transcript: selectedTranscript,
           question: question,
           chat_history: chatHistory,
-          model_name: 'gemma:2b'
+          model_name: 'gemma:2b',
+          stream: true
         })
       });
 
@@ -261,6 +304,31 @@ const Chatbot = () => {
         return null;
       }
 
+      // Streamed answer: Server-Sent Events with {token} or {error} payloads
+      if ((response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let answer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const events = buffer.split('\n\n');
+          buffer = events.pop();
+          for (const event of events) {
+            if (!event.startsWith('data: ')) continue;
+            const payload = JSON.parse(event.slice(6));
+            if (payload.error) {
+              return `Error: ${payload.error}`;
+            }
+            answer += payload.token;
+            onPartial?.(answer);
+          }
+        }
+        return answer.trim();
+      }
+
       const data = await response.json();
       
       if (data.error) {
@@ -289,7 +357,8 @@ const Chatbot = () => {
     hideSuggestions();
     
     // Get Ollama response
-    const answer = await askOllama(question);
+    const streamingMessage = createStreamingMessage();
+    const answer = await askOllama(question, streamingMessage.update);
 
     if (answer) {
       if (isTranscriptQuery(question)) {
@@ -302,6 +371,9 @@ const Chatbot = () => {
           time: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
         };
         setMessages(prev => [...prev, botMessage]);
+      } else if (streamingMessage.isStarted()) {
+        // Answer was streamed into its message already - store the final text
+        streamingMessage.update(answer);
       } else {
         const botMessage = {
           sender: "bot",
@@ -329,7 +401,8 @@ const Chatbot = () => {
     hideSuggestions();
     
     // Get Ollama response
-    const answer = await askOllama(question);
+    const streamingMessage = createStreamingMessage();
+    const answer = await askOllama(question, streamingMessage.update);
 
     if (answer) {
       if (isTranscriptQuery(question)) {
@@ -342,6 +415,9 @@ const Chatbot = () => {
           time: new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
         };
         setMessages(prev => [...prev, botMessage]);
+      } else if (streamingMessage.isStarted()) {
+        // Answer was streamed into its message already - store the final text
+        streamingMessage.update(answer);
       } else {
         const botMessage = {
           sender: "bot",
@@ -396,10 +472,7 @@ const Chatbot = () => {
   
   <div className="chat-window">
     {messages.map((msg, idx) => (
-      <div className={`chat-message ${msg.sender}`} key={idx}>
-        <p>{msg.text}</p>
-        <span className="chat-time">{msg.time}</span>
-      </div>
+      <ChatMessage key={idx} sender={msg.sender} text={msg.text} time={msg.time} />
     ))}
     {isLoading && (
       <div className="chat-message bot">
@@ -3,6 +3,14 @@ import { useNavigate } from 'react-router-dom'
 import "../style/Meetings.css"
 import Navbar from './Navbar'
 
+// Transcription status polling: every 3 seconds, giving up after 30 minutes
+const STATUS_POLL_INTERVAL_MS = 3000;
+const STATUS_POLL_MAX_MS = 30 * 60 * 1000;
+
+// Larger files skip the pre-upload hash: hashing reads the whole file into memory
+// (mobile browsers can run out of memory on long recordings)
+const CLIENT_HASH_MAX_BYTES = 64 * 1024 * 1024;
+
 const Meetings = () => {
   const navigate = useNavigate();
   const [isLoggedIn, setIsLoggedIn] = useState(false);
@@ -59,13 +67,38 @@ const Meetings = () => {
       formData.append('file', selectedFile);
       formData.append('meeting_name', meetingName);
 
-      const response = await fetch('/api/upload_audio', {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${token}`
-        },
-        body: formData
-      });
+      // Prefer: respond-async - answer 202 right away and let us poll the transcription status
+      const headers = { 'Authorization': `Bearer ${token}`, 'Prefer': 'respond-async' };
+
+      // Ask first (hash only, no body) whether this exact file was uploaded before, so a
+      // duplicate isn't sent again. Large files skip this and are checked by the server on upload.
+      let response = null;
+      if (selectedFile.size <= CLIENT_HASH_MAX_BYTES) {
+        try {
+          const digest = await crypto.subtle.digest('SHA-256', await selectedFile.arrayBuffer());
+          const contentSha256 = Array.from(new Uint8Array(digest))
+            .map((b) => b.toString(16).padStart(2, '0'))
+            .join('');
+          const checkResponse = await fetch('/api/upload_audio/check', {
+            method: 'POST',
+            headers: { ...headers, 'X-Content-SHA256': contentSha256 }
+          });
+          // 204: not uploaded before; anything else (the duplicate, or an error) is handled below
+          if (checkResponse.status !== 204) {
+            response = checkResponse;
+          }
+        } catch {
+          // crypto.subtle is only available in secure contexts - just upload
+        }
+      }
+
+      if (!response) {
+        response = await fetch('/api/upload_audio', {
+          method: 'POST',
+          headers,
+          body: formData
+        });
+      }
 
       if (response.status === 401) {
         // Token expired or invalid
@@ -82,9 +115,48 @@ const Meetings = () => {
         return;
       }
 
-      const data = await response.json();
+      let data = await response.json();
+
+      // Transcription runs in the background - poll its status, then fetch the finished meeting
+      if (data.status === 'pending') {
+        let status = data.status;
+        const pollDeadline = Date.now() + STATUS_POLL_MAX_MS;
+        while (status === 'pending') {
+          if (Date.now() >= pollDeadline) {
+            setUploadStatus('Still transcribing. Check back later - the transcript will appear in your meetings.');
+            setSelectedFile(null);
+            return;
+          }
+          setUploadStatus('Uploaded. Transcribing...');
+          await new Promise((resolve) => setTimeout(resolve, STATUS_POLL_INTERVAL_MS));
+          const pollResponse = await fetch(`/api/meeting/${data.meeting_id}/status`, {
+            headers: {
+              'Authorization': `Bearer ${token}`
+            }
+          });
+          if (!pollResponse.ok) {
+            const pollData = await pollResponse.json().catch(() => ({ error: 'Server error' }));
+            setUploadStatus(`Error: ${pollData.error}`);
+            return;
+          }
+          ({ status } = await pollResponse.json());
+        }
+
+        const meetingResponse = await fetch(`/api/meeting/${data.meeting_id}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!meetingResponse.ok) {
+          const meetingData = await meetingResponse.json().catch(() => ({ error: 'Server error' }));
+          setUploadStatus(`Error: ${meetingData.error}`);
+          return;
+        }
+        data = await meetingResponse.json();
+      }
+
       setTranscript(data.transcript);
-      setUploadStatus('✅ Transcription complete!');
+      setUploadStatus(data.status === 'error' ? `Error: ${data.transcript}` : '✅ Transcription complete!');
       setSelectedFile(null);
     } catch (error) {
       setUploadStatus(`Error: ${error.message}`);
@@ -0,0 +1,199 @@
+"""
+Storage for the data/*.json files shared by app.py and auto_fetch.py:
+cross-process lock, cached loads, atomic compact saves with deferred fsync,
+and the lock that picks the one process running background jobs.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+import orjson
+
+# fcntl is POSIX-only - on Windows the data lock only covers threads of this process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+DATA_LOCK_FILE = os.path.join(os.path.dirname(__file__), 'data', '.lock')
+
+
+class DataLock:
+    """
+    Re-entrant lock for load -> modify -> save cycles on the data/*.json files.
+    Holds a thread lock plus an flock on DATA_LOCK_FILE so several server processes are serialized too.
+    """
+    def __init__(self, lock_path):
+        self.lock_path = lock_path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lock_file = None
+    
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            self._lock_file = open(self.lock_path, 'w')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+        self._thread_lock.release()
+
+
+# Shared by app.py and auto_fetch.py so request threads and the fetcher thread don't overwrite each other.
+DATA_LOCK = DataLock(DATA_LOCK_FILE)
+
+def load_json(filepath):
+    """Load JSON file safely, returning {} if it is missing, empty or invalid"""
+    if os.path.exists(filepath):
+        try:
+            with open(filepath, 'rb') as f:
+                content = f.read().strip()
+                if content:
+                    return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return {}
+
+
+# Parsed JSON stores: path -> ((inode, mtime_ns, size), data).
+# Every save os.replace()s the file, so a new inode marks a change even within one mtime tick.
+# The cached dicts are shared between requests and polls - copy before mutating them.
+_json_cache = {}
+
+
+def load_json_cached(path):
+    """Load a JSON store, reusing the parsed data while the file is unchanged on disk"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    
+    data = load_json(path)
+    _json_cache[path] = (stamp, data)
+    return data
+
+
+def save_json_cached(path, data):
+    """
+    Write a JSON store and keep the saved dict as its cached copy, so the next
+    load doesn't parse the file again. Callers hold DATA_LOCK, so nothing else
+    can replace the file between the write and the stat.
+    """
+    save_json(path, data)
+    st = os.stat(path)
+    _json_cache[path] = ((st.st_ino, st.st_mtime_ns, st.st_size), data)
+
+
+# Directories whose renames haven't been fsynced yet; sync_json_files flushes them together
+JSON_SYNC_INTERVAL = 1.0  # seconds
+_unsynced_dirs = set()
+_unsynced_lock = threading.Lock()
+_unsynced_event = threading.Event()
+_sync_thread_pid = None
+
+
+def save_json(filepath, data):
+    """
+    Save JSON file safely (write to a temp file, fsync it, then atomically replace),
+    so neither readers nor a crash ever see a truncated store.
+    Only the directory fsync that makes the rename durable is deferred to
+    sync_json_files, so a burst of saves shares one; after a power loss the
+    store is either the new or the previous complete version.
+    Output is compact - run `python -m json.tool <file>` to read one.
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+    
+    with _unsynced_lock:
+        _unsynced_dirs.add(os.path.dirname(filepath))
+    _unsynced_event.set()
+    start_json_sync()
+
+
+def sync_json_files():
+    """fsync the directories of stores saved since the last call, persisting their renames"""
+    with _unsynced_lock:
+        directories = sorted(_unsynced_dirs)
+        _unsynced_dirs.clear()
+    
+    for path in directories:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # e.g. directories can't be opened on Windows
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def json_sync_worker():
+    """Background thread: fsync the store directories at most every JSON_SYNC_INTERVAL"""
+    while True:
+        _unsynced_event.wait()
+        time.sleep(JSON_SYNC_INTERVAL)
+        _unsynced_event.clear()
+        sync_json_files()
+
+
+def start_json_sync():
+    """Start the fsync thread in this process (again after a fork, e.g. Gunicorn workers)"""
+    global _sync_thread_pid
+    if _sync_thread_pid != os.getpid():
+        _sync_thread_pid = os.getpid()
+        threading.Thread(target=json_sync_worker, daemon=True).start()
+
+
+# Flush anything still pending on a clean shutdown
+atexit.register(sync_json_files)
+
+
+# Under Gunicorn only one worker runs the background jobs: the first one to take a
+# non-blocking flock on this file. The lock goes away with that worker, and the
+# worker Gunicorn starts in its place takes it over.
+BACKGROUND_LOCK_FILE = os.path.join(os.path.dirname(__file__), 'data', '.background.lock')
+_background_lock_file = None
+
+
+def claim_background_jobs():
+    """Return True if this process should run the background jobs (auto-fetch etc.)"""
+    global _background_lock_file
+    if _background_lock_file is not None:
+        return True
+    if fcntl is None:
+        # No flock (Windows) - only the single-process development server runs there
+        return True
+    
+    os.makedirs(os.path.dirname(BACKGROUND_LOCK_FILE), exist_ok=True)
+    lock_file = open(BACKGROUND_LOCK_FILE, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # Another worker already runs them
+        lock_file.close()
+        return False
+    _background_lock_file = lock_file
+    return True